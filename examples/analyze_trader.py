@@ -8,23 +8,26 @@ combining multiple API endpoints to build a comprehensive profile.
 Usage:
     python analyze_trader.py --address 0x56687bf447db6ffa42ffe2204a05edaa20f55839
     python analyze_trader.py --address 0x... --top-positions 10
+    python analyze_trader.py --address 0x... --exact-value
 """
 
-import requests
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from utils import format_address, format_pnl, format_percentage
+from heapq import nlargest
+from api_client import SESSION, enable_cache, parse_json, parse_json_list
+from utils import configure_stdout, format_address, format_pnl, format_percentage, write_lines, make_address_parser, reduce_pnl
 
 
 def get_portfolio_value(address):
     """Get total portfolio value"""
     url = "https://data-api.polymarket.com/value"
     try:
-        response = requests.get(url, params={"user": address}, timeout=10)
+        response = SESSION.get(url, params={"user": address}, timeout=10)
         response.raise_for_status()
-        data = response.json()
-        return data[0].get('value', 0) if isinstance(data, list) and len(data) > 0 else 0
+        data = parse_json_list(response)
+        return data[0].get('value', 0) if data else 0
     except:
         return 0
 
@@ -33,9 +36,9 @@ def get_positions(address, limit=10):
     """Get user's current positions"""
     url = "https://data-api.polymarket.com/positions"
     try:
-        response = requests.get(url, params={"user": address, "limit": limit, "sortBy": "CASHPNL", "sortDirection": "DESC"}, timeout=15)
+        response = SESSION.get(url, params={"user": address, "limit": limit, "sortBy": "CASHPNL", "sortDirection": "DESC"}, timeout=15)
         response.raise_for_status()
-        return response.json()
+        return parse_json_list(response)
     except:
         return []
 
@@ -44,9 +47,9 @@ def get_recent_trades(address, limit=20):
     """Get recent trading activity"""
     url = "https://data-api.polymarket.com/trades"
     try:
-        response = requests.get(url, params={"user": address, "limit": limit}, timeout=15)
+        response = SESSION.get(url, params={"user": address, "limit": limit}, timeout=15)
         response.raise_for_status()
-        return response.json()
+        return parse_json_list(response)
     except:
         return []
 
@@ -55,9 +58,9 @@ def get_markets_traded(address):
     """Get total markets traded count"""
     url = "https://data-api.polymarket.com/traded"
     try:
-        response = requests.get(url, params={"user": address}, timeout=10)
+        response = SESSION.get(url, params={"user": address}, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = parse_json(response)
         return data.get('traded', 0)
     except:
         return 0
@@ -67,20 +70,98 @@ def get_closed_positions(address, limit=50):
     """Get closed positions with realized P&L"""
     url = "https://data-api.polymarket.com/closed-positions"
     try:
-        response = requests.get(url, params={"user": address, "limit": limit}, timeout=15)
+        response = SESSION.get(url, params={"user": address, "limit": limit}, timeout=15)
         response.raise_for_status()
-        return response.json()
+        return parse_json_list(response)
     except:
         return []
 
 
-def analyze_trader(address, top_positions_count=5):
+# Max positions per request - fetching a full page lets one /positions
+# response feed the value estimate, position count and top-N slice
+POSITIONS_LIMIT = 500
+
+def fetch_user_bundle(address, exact_value=False):
+    """
+    Fetch every endpoint needed for a trader analysis exactly once.
+    
+    The portfolio value is estimated by summing currentValue over the
+    /positions response. /value is requested when exact_value is set, or
+    when the response came back full (POSITIONS_LIMIT positions), since
+    the sum would then miss the wallet's remaining positions.
+    
+    Args:
+        address (str): Formatted wallet address
+        exact_value (bool): Fetch the exact portfolio value from /value
+    
+    Returns:
+        dict: positions, closed_positions, trades, markets_traded,
+              portfolio_value and portfolio_value_estimated
+    """
+    # Fetch all data concurrently - the endpoints are independent, so the
+    # total wait is the slowest request instead of the sum of all of them.
+    # Each helper already falls back to a default value on errors.
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        positions_future = executor.submit(get_positions, address, POSITIONS_LIMIT)
+        closed_future = executor.submit(get_closed_positions, address, 50)
+        trades_future = executor.submit(get_recent_trades, address, 100)
+        markets_future = executor.submit(get_markets_traded, address)
+        value_future = executor.submit(get_portfolio_value, address) if exact_value else None
+    
+    positions = positions_future.result()
+    
+    # A full page may be truncated, so only /value gives the real total
+    value_estimated = value_future is None and len(positions) < POSITIONS_LIMIT
+    
+    if value_future:
+        portfolio_value = value_future.result()
+    elif not value_estimated:
+        portfolio_value = get_portfolio_value(address)
+    else:
+        portfolio_value = sum(p.get('currentValue', 0) for p in positions)
+    
+    return {
+        "positions": positions,
+        "closed_positions": closed_future.result(),
+        "trades": trades_future.result(),
+        "markets_traded": markets_future.result(),
+        "portfolio_value": portfolio_value,
+        "portfolio_value_estimated": value_estimated,
+    }
+
+
+def reduce_volume(trades):
+    """
+    Split trade counts and volume into buys and sells in a single pass.
+    
+    Args:
+        trades (list): Trade dicts
+    
+    Returns:
+        tuple: (buy count, sell count, buy volume, sell volume)
+    """
+    buy_count = sell_count = 0
+    buy_volume = sell_volume = 0
+    for trade in trades:
+        get = trade.get
+        side = get('side')
+        if side == 'BUY':
+            buy_count += 1
+            buy_volume += get('size', 0) * get('price', 0)
+        elif side == 'SELL':
+            sell_count += 1
+            sell_volume += get('size', 0) * get('price', 0)
+    return buy_count, sell_count, buy_volume, sell_volume
+
+
+def analyze_trader(address, top_positions_count=5, exact_value=False):
     """
     Perform comprehensive trader analysis.
     
     Args:
         address (str): Wallet address
         top_positions_count (int): Number of top positions to show
+        exact_value (bool): Fetch exact portfolio value from /value
     
     Returns:
         dict: Comprehensive trader stats
@@ -88,19 +169,20 @@ def analyze_trader(address, top_positions_count=5):
     print(f"🔍 Analyzing trader {address}...")
     print()
     
-    # Fetch all data
-    portfolio_value = get_portfolio_value(address)
-    positions = get_positions(address, top_positions_count * 2)
-    closed_positions = get_closed_positions(address, 50)
-    trades = get_recent_trades(address, 100)
-    markets_count = get_markets_traded(address)
+    bundle = fetch_user_bundle(address, exact_value)
+    positions = bundle["positions"]
+    closed_positions = bundle["closed_positions"]
+    trades = bundle["trades"]
     
     # Calculate statistics
     stats = {
         "address": address,
-        "portfolio_value": portfolio_value,
+        "portfolio_value": bundle["portfolio_value"],
+        "portfolio_value_estimated": bundle["portfolio_value_estimated"],
         "active_positions": len(positions),
-        "markets_traded": markets_count,
+        # A full page means the wallet may hold more than were fetched
+        "active_positions_capped": len(positions) >= POSITIONS_LIMIT,
+        "markets_traded": bundle["markets_traded"],
         "total_trades": len(trades),
     }
     
@@ -109,22 +191,21 @@ def analyze_trader(address, top_positions_count=5):
     realized_from_partials = 0
     
     if positions:
-        unrealized_pnl = sum(p.get('cashPnl', 0) for p in positions)
-        realized_from_partials = sum(p.get('realizedPnl', 0) for p in positions)
-        winning_positions = [p for p in positions if p.get('cashPnl', 0) > 0]
-        losing_positions = [p for p in positions if p.get('cashPnl', 0) < 0]
+        unrealized_pnl, realized_from_partials, winning, losing = reduce_pnl(
+            positions, 'cashPnl', partial_key='realizedPnl'
+        )
         
         stats["total_unrealized_pnl"] = unrealized_pnl
-        stats["winning_positions"] = len(winning_positions)
-        stats["losing_positions"] = len(losing_positions)
+        stats["winning_positions"] = winning
+        stats["losing_positions"] = losing
     
     # Closed positions analysis
     realized_pnl = 0
     if closed_positions:
-        realized_pnl = sum(p.get('realizedPnl', 0) for p in closed_positions)
+        realized_pnl, _, winning, losing = reduce_pnl(closed_positions, 'realizedPnl')
         stats["closed_positions_count"] = len(closed_positions)
-        stats["winning_closed"] = len([p for p in closed_positions if p.get('realizedPnl', 0) > 0])
-        stats["losing_closed"] = len([p for p in closed_positions if p.get('realizedPnl', 0) < 0])
+        stats["winning_closed"] = winning
+        stats["losing_closed"] = losing
     
     # Calculate TOTAL P&L
     total_realized = realized_pnl + realized_from_partials
@@ -142,28 +223,27 @@ def analyze_trader(address, top_positions_count=5):
     
     # Trading analysis
     if trades:
-        buys = [t for t in trades if t.get('side') == 'BUY']
-        sells = [t for t in trades if t.get('side') == 'SELL']
-        
-        total_buy_volume = sum(t.get('size', 0) * t.get('price', 0) for t in buys)
-        total_sell_volume = sum(t.get('size', 0) * t.get('price', 0) for t in sells)
+        buy_count, sell_count, total_buy_volume, total_sell_volume = reduce_volume(trades)
         
-        stats["buy_trades"] = len(buys)
-        stats["sell_trades"] = len(sells)
+        stats["buy_trades"] = buy_count
+        stats["sell_trades"] = sell_count
         stats["buy_volume"] = total_buy_volume
         stats["sell_volume"] = total_sell_volume
         stats["total_volume"] = total_buy_volume + total_sell_volume
     
-    return stats, positions[:top_positions_count], trades[:20]
+    # Select the top-N locally so the display never depends on the
+    # response order; stats above already cover the full page
+    top_positions = nlargest(top_positions_count, positions, key=lambda p: p.get('cashPnl', 0))
+    
+    return stats, top_positions, trades[:20]
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Comprehensive Polymarket trader analysis")
-    parser.add_argument(
-        "--address",
-        type=str,
-        required=True,
-        help="Wallet address (0x...)"
+def main(argv=None):
+    configure_stdout()
+    
+    parser = argparse.ArgumentParser(
+        description="Comprehensive Polymarket trader analysis",
+        parents=[make_address_parser()]
     )
     parser.add_argument(
         "--top-positions",
@@ -171,7 +251,15 @@ def main():
         default=5,
         help="Number of top positions to display (default: 5)"
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--exact-value",
+        action="store_true",
+        help="Fetch exact portfolio value from /value (default: sum of position values, or /value for wallets with 500+ positions)"
+    )
+    args = parser.parse_args(argv)
+    
+    if args.cache:
+        enable_cache()
     
     try:
         formatted_address = format_address(args.address)
@@ -185,11 +273,15 @@ def main():
     print()
     
     # Run analysis
-    stats, top_positions, recent_trades = analyze_trader(formatted_address, args.top_positions)
+    stats, top_positions, recent_trades = analyze_trader(formatted_address, args.top_positions, args.exact_value)
+    
+    # Collect the report and write it to stdout in one call
+    lines = []
+    out = lines.append
     
     # Display Summary
-    print("📊 PORTFOLIO SUMMARY")
-    print("-" * 100)
+    out("📊 PORTFOLIO SUMMARY")
+    out("-" * 100)
     
     # Profitability verdict
     if 'total_pnl' in stats:
@@ -200,71 +292,77 @@ def main():
             verdict = "❌ IN LOSS"
         else:
             verdict = "⚖️  BREAK EVEN"
-        print(f"Status: {verdict}")
-        print(f"TOTAL P&L: {format_pnl(total_pnl)}")
-        print()
+        out(f"Status: {verdict}")
+        out(f"TOTAL P&L: {format_pnl(total_pnl)}")
+        out("")
     
-    print(f"Total Portfolio Value: ${stats['portfolio_value']:,.2f}")
-    print(f"Active Positions: {stats['active_positions']}")
-    print(f"Closed Positions: {stats.get('closed_positions_count', 0)}")
-    print(f"Markets Traded: {stats['markets_traded']}")
+    value_note = " (estimated from positions)" if stats['portfolio_value_estimated'] else ""
+    out(f"Total Portfolio Value: ${stats['portfolio_value']:,.2f}{value_note}")
+    capped_note = f"+ (only the first {POSITIONS_LIMIT} analyzed)" if stats.get('active_positions_capped') else ""
+    out(f"Active Positions: {stats['active_positions']}{capped_note}")
+    out(f"Closed Positions: {stats.get('closed_positions_count', 0)}")
+    out(f"Markets Traded: {stats['markets_traded']}")
     
     if 'total_unrealized_pnl' in stats:
-        print(f"\n💰 P&L Breakdown:")
-        print(f"  Unrealized P&L: {format_pnl(stats['total_unrealized_pnl'])} (from active positions)")
-        print(f"  Realized P&L:   {format_pnl(stats.get('total_realized_pnl', 0))} (from closed positions)")
-        print(f"\n📊 Win/Loss Statistics:")
-        print(f"  Active - Winning: {stats['winning_positions']} | Losing: {stats['losing_positions']}")
+        out(f"\n💰 P&L Breakdown:")
+        out(f"  Unrealized P&L: {format_pnl(stats['total_unrealized_pnl'])} (from active positions)")
+        out(f"  Realized P&L:   {format_pnl(stats.get('total_realized_pnl', 0))} (from closed positions)")
+        out(f"\n📊 Win/Loss Statistics:")
+        out(f"  Active - Winning: {stats['winning_positions']} | Losing: {stats['losing_positions']}")
         if 'winning_closed' in stats:
-            print(f"  Closed - Winning: {stats['winning_closed']} | Losing: {stats['losing_closed']}")
-        print(f"  Overall Win Rate: {stats.get('win_rate', 0):.1f}%")
+            out(f"  Closed - Winning: {stats['winning_closed']} | Losing: {stats['losing_closed']}")
+        out(f"  Overall Win Rate: {stats.get('win_rate', 0):.1f}%")
     
     # Display Trading Activity
-    print(f"\n\n📈 TRADING ACTIVITY")
-    print("-" * 100)
-    print(f"Total Trades: {stats['total_trades']}")
+    out(f"\n\n📈 TRADING ACTIVITY")
+    out("-" * 100)
+    out(f"Total Trades: {stats['total_trades']}")
     
     if 'buy_trades' in stats:
-        print(f"  Buy Trades: {stats['buy_trades']} (${stats['buy_volume']:,.2f})")
-        print(f"  Sell Trades: {stats['sell_trades']} (${stats['sell_volume']:,.2f})")
-        print(f"  Total Volume: ${stats['total_volume']:,.2f}")
+        out(f"  Buy Trades: {stats['buy_trades']} (${stats['buy_volume']:,.2f})")
+        out(f"  Sell Trades: {stats['sell_trades']} (${stats['sell_volume']:,.2f})")
+        out(f"  Total Volume: ${stats['total_volume']:,.2f}")
     
     # Display Top Positions
     if top_positions:
-        print(f"\n\n💼 TOP {len(top_positions)} POSITIONS (by P&L)")
-        print("-" * 100)
+        out(f"\n\n💼 TOP {len(top_positions)} POSITIONS (by P&L)")
+        out("-" * 100)
         
         for i, pos in enumerate(top_positions, 1):
-            print(f"\n{i}. {pos['title']}")
-            print(f"   Outcome: {pos['outcome']}")
-            print(f"   Size: {pos.get('size', 0):,.2f} shares @ ${pos.get('avgPrice', 0):.4f}")
-            print(f"   Current: ${pos.get('currentValue', 0):,.2f}")
+            get = pos.get
+            out(f"\n{i}. {pos['title']}")
+            out(f"   Outcome: {pos['outcome']}")
+            out(f"   Size: {get('size', 0):,.2f} shares @ ${get('avgPrice', 0):.4f}")
+            out(f"   Current: ${get('currentValue', 0):,.2f}")
             
-            cash_pnl = pos.get('cashPnl', 0)
-            percent_pnl = pos.get('percentPnl', 0)
-            print(f"   P&L: {format_pnl(cash_pnl)} ({format_percentage(percent_pnl)})")
+            cash_pnl = get('cashPnl', 0)
+            percent_pnl = get('percentPnl', 0)
+            out(f"   P&L: {format_pnl(cash_pnl)} ({format_percentage(percent_pnl)})")
     
     # Display Recent Trades
     if recent_trades:
-        print(f"\n\n📋 RECENT TRADING ACTIVITY (Last {len(recent_trades)} trades)")
-        print("-" * 100)
+        out(f"\n\n📋 RECENT TRADING ACTIVITY (Last {len(recent_trades)} trades)")
+        out("-" * 100)
         
         for i, trade in enumerate(recent_trades[:10], 1):
-            side = trade.get('side', 'UNKNOWN')
+            get = trade.get
+            side = get('side', 'UNKNOWN')
             side_emoji = "🟢" if side == "BUY" else "🔴"
             
-            timestamp = trade.get('timestamp')
+            timestamp = get('timestamp')
             time_str = datetime.fromtimestamp(timestamp).strftime('%m/%d %H:%M') if timestamp else 'N/A'
             
-            size = trade.get('size', 0)
-            price = trade.get('price', 0)
+            size = get('size', 0)
+            price = get('price', 0)
             
-            print(f"{i:2d}. {time_str} | {side_emoji} {side:4s} | {size:8,.2f} @ ${price:.4f} | {trade.get('outcome', 'N/A'):3s}")
+            out(f"{i:2d}. {time_str} | {side_emoji} {side:4s} | {size:8,.2f} @ ${price:.4f} | {get('outcome', 'N/A'):3s}")
             if i == 1 or i % 5 == 0:
-                print(f"     {trade.get('title', 'Unknown market')[:70]}...")
+                out(f"     {get('title', 'Unknown market')[:70]}...")
+    
+    out("\n" + "=" * 100)
+    out("Analysis complete!")
     
-    print("\n" + "=" * 100)
-    print("Analysis complete!")
+    write_lines(lines)
 
 
 if __name__ == "__main__":
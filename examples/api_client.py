@@ -0,0 +1,341 @@
+"""
+HTTP session for Polymarket Data API examples
+
+This module provides a shared requests.Session used by the example
+scripts, so repeated calls reuse one pooled keep-alive connection
+instead of paying a new TCP + TLS handshake per request. GET responses
+can optionally be cached on disk for a short time (see enable_cache),
+and requests are paced to stay under the API's rate limits.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:  # optional - fall back to response.json()
+    orjson = None
+
+
+# Connections kept open to data-api.polymarket.com. Concurrent helpers
+# never run more requests than this at once, so every request reuses a
+# pooled connection instead of opening (and discarding) an extra one.
+MAX_CONNECTIONS = 8
+
+# Where cached responses are stored (one sub-directory per endpoint)
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "polymarket-data-api")
+
+# Freshness (seconds) per endpoint path, overriding the session default.
+# Open positions move with prices; closed positions are history that
+# rarely changes.
+ENDPOINT_EXPIRE_AFTER = {
+    "/positions": 60,
+    "/trades": 300,
+    "/closed-positions": 86400,
+}
+
+# Leaderboard freshness (seconds) by timePeriod. A daily board moves
+# quickly; the all-time board hardly changes between runs.
+LEADERBOARD_PATH = "/v1/leaderboard"
+LEADERBOARD_EXPIRE_AFTER = {
+    "DAY": 60,
+    "WEEK": 300,
+    "MONTH": 900,
+    "ALL": 3600,
+}
+
+# Requests allowed per RATE_WINDOW seconds, per endpoint path. The Data
+# API enforces these over sliding 10 second windows and answers 429 once
+# they are exceeded, so callers are paced just below them instead.
+RATE_WINDOW = 10
+DEFAULT_RATE_LIMIT = 200
+ENDPOINT_RATE_LIMITS = {
+    "/trades": 75,
+    "/positions": 150,
+    "/closed-positions": 150,
+}
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing limit requests per window seconds.
+    
+    Bursts of up to limit requests go out immediately; after that callers
+    are spaced evenly at the sustained rate.
+    """
+    
+    def __init__(self, limit, window=RATE_WINDOW):
+        self.rate = limit / window
+        self.capacity = limit
+        self.tokens = limit
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Take one token, sleeping until it is available"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token even if it is not there yet, so concurrent
+            # callers queue up behind each other instead of all waking at once
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        
+        if wait:
+            time.sleep(wait)
+
+
+class CachedSession(requests.Session):
+    """
+    requests.Session that can serve GET responses from an on-disk cache.
+    
+    Caching is off by default. Once enabled, successful GET responses are
+    stored under CACHE_DIR keyed by URL + sorted query params, and reused
+    until they are older than the endpoint's entry in urls_expire_after
+    (for the leaderboard, the timePeriod's entry in
+    LEADERBOARD_EXPIRE_AFTER), or expire_after seconds otherwise.
+    
+    Requests that do go to the network first take a token from the
+    endpoint's TokenBucket (see ENDPOINT_RATE_LIMITS).
+    """
+    
+    def __init__(self, cache_dir=CACHE_DIR):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.cache_enabled = False
+        self.expire_after = 60
+        self.urls_expire_after = dict(ENDPOINT_EXPIRE_AFTER)
+        self.rate_limiters = {
+            path: TokenBucket(limit) for path, limit in ENDPOINT_RATE_LIMITS.items()
+        }
+        self.default_rate_limiter = TokenBucket(DEFAULT_RATE_LIMIT)
+    
+    def _rate_limiter(self, url):
+        """TokenBucket that paces requests to url's endpoint"""
+        return self.rate_limiters.get(urlsplit(url).path, self.default_rate_limiter)
+    
+    def _expire_after(self, url, params):
+        """Seconds a cached response for url + params stays fresh"""
+        path = urlsplit(url).path
+        if path == LEADERBOARD_PATH and params:
+            return LEADERBOARD_EXPIRE_AFTER.get(params.get("timePeriod"), self.expire_after)
+        return self.urls_expire_after.get(path, self.expire_after)
+    
+    def _cache_path(self, url, params):
+        """Cache file for a URL + params pair"""
+        query = urlencode(sorted((params or {}).items()))
+        digest = hashlib.md5(f"{url}?{query}".encode()).hexdigest()
+        endpoint = urlsplit(url).path.strip("/").replace("/", "_") or "root"
+        return os.path.join(self.cache_dir, endpoint, f"{digest}.json")
+    
+    def request(self, method, url, params=None, **kwargs):
+        cache_path = None
+        if self.cache_enabled and method.upper() == "GET":
+            cache_path = self._cache_path(url, params)
+            try:
+                if time.time() - os.path.getmtime(cache_path) < self._expire_after(url, params):
+                    with open(cache_path, "rb") as f:
+                        return _cached_response(url, f.read())
+            except OSError:
+                pass  # not cached yet
+        
+        self._rate_limiter(url).acquire()
+        response = super().request(method, url, params=params, **kwargs)
+        if cache_path and response.ok:
+            _write_atomic(cache_path, response.content)
+        return response
+
+
+def _cached_response(url, content):
+    """Build a requests.Response from cached body bytes"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response.encoding = "utf-8"
+    response.headers["Content-Type"] = "application/json"
+    response._content = content
+    response.from_cache = True
+    return response
+
+
+def _write_atomic(path, content):
+    """Write bytes to path without exposing a half-written file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+    with os.fdopen(fd, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def create_session():
+    """
+    Create a requests.Session configured for the Data API.
+    
+    The session keeps connections alive between calls, asks for
+    compressed JSON responses, paces requests per endpoint, and retries
+    rate-limit (429) and transient server errors (5xx). A 429/503 with a
+    Retry-After header waits as long as the server asks; otherwise waits
+    back off exponentially (0.5s, 1s, 2s, ...). On urllib3 2.x the waits
+    are capped at 30s and jittered, so concurrent callers do not all
+    retry at the same moment; urllib3 1.26 has no jitter option and
+    caps them at its default of 120s.
+    
+    Returns:
+        CachedSession: Configured session (caching disabled)
+    """
+    retry_options = {
+        "total": 5,
+        "backoff_factor": 0.5,
+        "status_forcelist": [429, 500, 502, 503, 504],
+        "respect_retry_after_header": True,
+    }
+    # backoff_max/backoff_jitter were added in urllib3 2.0; requests
+    # still supports 1.26, where passing them raises TypeError
+    if int(urllib3.__version__.split(".")[0]) >= 2:
+        retry_options.update(backoff_max=30, backoff_jitter=0.3)
+    retries = Retry(**retry_options)
+    # pool_block: callers beyond MAX_CONNECTIONS wait for a free pooled
+    # connection rather than paying a new TCP + TLS handshake
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=MAX_CONNECTIONS,
+        pool_block=True,
+        max_retries=retries
+    )
+    
+    session = CachedSession()
+    session.mount("https://", adapter)
+    # JSON compresses well; ACCEPT_ENCODING adds br (and zstd) only when
+    # urllib3 can decode them, i.e. brotli/zstandard are installed
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": ACCEPT_ENCODING,
+    })
+    return session
+
+
+# Shared session - import this instead of calling requests.get directly
+SESSION = create_session()
+
+
+def enable_cache(expire_after=60):
+    """
+    Cache GET responses of the shared SESSION on disk.
+    
+    Repeated runs for the same wallet are served from CACHE_DIR without
+    touching the network while the cached response is fresh: per
+    ENDPOINT_EXPIRE_AFTER for /positions, /trades and /closed-positions,
+    per LEADERBOARD_EXPIRE_AFTER for the leaderboard's timePeriod, and
+    expire_after seconds for every other endpoint.
+    
+    Args:
+        expire_after (int): Seconds a cached response stays fresh
+            (endpoints without their own entry in ENDPOINT_EXPIRE_AFTER)
+    """
+    SESSION.cache_enabled = True
+    SESSION.expire_after = expire_after
+
+
+class SchemaError(requests.exceptions.RequestException):
+    """Response JSON does not have the shape the endpoint documents"""
+
+
+def parse_json(response):
+    """
+    Decode a JSON response body.
+    
+    Uses orjson (a faster C parser) when it is installed, otherwise
+    falls back to response.json(). Both return the same dicts and lists.
+    
+    Args:
+        response (requests.Response): Response to decode
+    
+    Returns:
+        dict | list: Decoded JSON
+    
+    Raises:
+        requests.exceptions.JSONDecodeError: If the body is not valid JSON
+    """
+    if orjson is None:
+        return response.json()
+    
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos)
+
+
+def parse_json_list(response):
+    """
+    Decode a JSON response that must be a list.
+    
+    List endpoints (/positions, /trades, /activity, /value, ...) are
+    validated once here, so callers can use the result without their
+    own isinstance/len checks.
+    
+    Args:
+        response (requests.Response): Response to decode
+    
+    Returns:
+        list: Decoded JSON list (possibly empty)
+    
+    Raises:
+        SchemaError: If the body is valid JSON but not a list
+    """
+    data = parse_json(response)
+    if not isinstance(data, list):
+        raise SchemaError(
+            f"Expected a JSON list from {response.url}, got {type(data).__name__}"
+        )
+    return data
+
+
+def fetch_pages(fetch_page, total, page_size, start=0, max_workers=4):
+    """
+    Fetch up to total items as offset pages requested concurrently.
+    
+    All pages are requested at once (at most max_workers in flight), so
+    the wait is roughly one page's latency instead of one per page.
+    Results are joined in offset order, stopping at the first page that
+    comes back short, empty or failed (None). An exception raised by
+    fetch_page is re-raised here, so callers can fail the whole fetch
+    instead of returning a partial list.
+    
+    Args:
+        fetch_page (callable): fetch_page(offset, limit) -> list or None
+        total (int): Maximum number of items to fetch
+        page_size (int): Items per request (the endpoint's max limit)
+        start (int): Offset of the first item
+        max_workers (int): Maximum concurrent requests
+    
+    Returns:
+        list: Fetched items, in order
+    """
+    page_requests = [
+        (offset, min(page_size, start + total - offset))
+        for offset in range(start, start + total, page_size)
+    ]
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pages = list(executor.map(lambda req: fetch_page(*req), page_requests))
+    
+    items = []
+    for (_, limit), page in zip(page_requests, pages):
+        if not page:
+            break
+        items.extend(page)
+        if len(page) < limit:
+            break
+    return items
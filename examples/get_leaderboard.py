@@ -10,11 +10,17 @@ Usage:
     python get_leaderboard.py --category FINANCE --period MONTH
     python get_leaderboard.py --category CRYPTO --period WEEK --order VOL
     python get_leaderboard.py --limit 50
+    python get_leaderboard.py --matrix --order VOL
 """
 
 import requests
 import argparse
-from utils import format_pnl, format_percentage
+from concurrent.futures import ThreadPoolExecutor
+from api_client import MAX_CONNECTIONS, SESSION, enable_cache, parse_json_list
+from utils import configure_stdout, format_pnl, format_percentage
+
+CATEGORIES = ["OVERALL", "POLITICS", "SPORTS", "CRYPTO", "CULTURE", "FINANCE", "TECH", "ECONOMICS", "WEATHER", "MENTIONS"]
+PERIODS = ["DAY", "WEEK", "MONTH", "ALL"]
 
 
 def get_leaderboard(category="OVERALL", time_period="DAY", order_by="PNL", limit=25):
@@ -39,28 +45,78 @@ def get_leaderboard(category="OVERALL", time_period="DAY", order_by="PNL", limit
     }
     
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = SESSION.get(url, params=params, timeout=15)
         response.raise_for_status()
-        return response.json()
+        return parse_json_list(response)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching leaderboard: {e}")
         return None
 
 
+def get_leaderboard_matrix(categories, periods, order_by="PNL", limit=25, max_workers=MAX_CONNECTIONS):
+    """
+    Get leaderboards for every (category, period) pair concurrently.
+    
+    At most max_workers requests are in flight at once, to stay clear of
+    the API rate limit.
+    
+    Args:
+        categories (list): Leaderboard categories
+        periods (list): Time periods
+        order_by (str): PNL or VOL
+        limit (int): Number of traders per leaderboard (max: 50)
+        max_workers (int): Maximum concurrent requests
+    
+    Returns:
+        dict: Leaderboard rankings keyed by (category, period)
+    """
+    pairs = [(category, period) for category in categories for period in periods]
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(
+            lambda pair: get_leaderboard(pair[0], pair[1], order_by, limit),
+            pairs
+        )
+        return dict(zip(pairs, results))
+
+
+def display_matrix(matrix, order_by="PNL"):
+    """Display the #1 trader of each (category, period) leaderboard"""
+    metric = "P&L" if order_by == "PNL" else "Volume"
+    
+    print(f"🏆 Leaderboard Leaders by {metric}")
+    print("=" * 100)
+    
+    for (category, period), leaderboard in matrix.items():
+        if not leaderboard:
+            print(f"{category:<10} {period:<6} (no data)")
+            continue
+        
+        leader = leaderboard[0]
+        username = leader.get('userName', 'Anonymous')
+        if order_by == "PNL":
+            value = format_pnl(leader.get('pnl', 0))
+        else:
+            value = f"${leader.get('vol', 0):,.2f}"
+        print(f"{category:<10} {period:<6} {username[:30]:<30} {value}")
+
+
 def main():
+    configure_stdout()
+    
     parser = argparse.ArgumentParser(description="Get Polymarket leaderboard")
     parser.add_argument(
         "--category",
         type=str,
         default="OVERALL",
-        choices=["OVERALL", "POLITICS", "SPORTS", "CRYPTO", "CULTURE", "FINANCE", "TECH", "ECONOMICS", "WEATHER", "MENTIONS"],
+        choices=CATEGORIES,
         help="Leaderboard category (default: OVERALL)"
     )
     parser.add_argument(
         "--period",
         type=str,
         default="DAY",
-        choices=["DAY", "WEEK", "MONTH", "ALL"],
+        choices=PERIODS,
         help="Time period (default: DAY)"
     )
     parser.add_argument(
@@ -76,8 +132,26 @@ def main():
         default=25,
         help="Number of traders (default: 25, max: 50)"
     )
+    parser.add_argument(
+        "--matrix",
+        action="store_true",
+        help="Show the #1 trader for every category and period (fetched concurrently)"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache API responses on disk, from 60 seconds (DAY) to 1 hour (ALL)"
+    )
     args = parser.parse_args()
     
+    if args.cache:
+        enable_cache()
+    
+    if args.matrix:
+        matrix = get_leaderboard_matrix(CATEGORIES, PERIODS, args.order, limit=1)
+        display_matrix(matrix, args.order)
+        return
+    
     metric = "P&L" if args.order == "PNL" else "Volume"
     
     print(f"🏆 {args.category} Leaderboard - {args.period} (Top by {metric})")
@@ -86,11 +160,11 @@ def main():
     
     leaderboard = get_leaderboard(args.category, args.period, args.order, args.limit)
     
-    if not leaderboard:
+    if leaderboard is None:
         print("No leaderboard data found or error occurred.")
         return
     
-    if not isinstance(leaderboard, list) or len(leaderboard) == 0:
+    if not leaderboard:
         print("No traders found on leaderboard.")
         return
     
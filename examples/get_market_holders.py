@@ -13,7 +13,8 @@ Usage:
 import requests
 import argparse
 import sys
-from utils import format_condition_id
+from api_client import SESSION, enable_cache, parse_json_list
+from utils import configure_stdout, format_condition_id
 
 
 def get_market_holders(condition_id, limit=10):
@@ -21,7 +22,7 @@ def get_market_holders(condition_id, limit=10):
     Get top holders for a market.
     
     Args:
-        condition_id (str): Market condition ID (0x... 66 chars)
+        condition_id (str): Condition ID, already formatted with format_condition_id()
         limit (int): Number of holders per token (max: 20)
     
     Returns:
@@ -29,20 +30,22 @@ def get_market_holders(condition_id, limit=10):
     """
     url = "https://data-api.polymarket.com/holders"
     params = {
-        "market": format_condition_id(condition_id),
+        "market": condition_id,
         "limit": min(limit, 20)
     }
     
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = SESSION.get(url, params=params, timeout=15)
         response.raise_for_status()
-        return response.json()
+        return parse_json_list(response)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching holders: {e}")
         return None
 
 
 def main():
+    configure_stdout()
+    
     parser = argparse.ArgumentParser(description="Get top holders for a Polymarket market")
     parser.add_argument(
         "--market",
@@ -56,8 +59,16 @@ def main():
         default=10,
         help="Max holders per outcome (default: 10, max: 20)"
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache API responses on disk for 60 seconds (faster repeat runs)"
+    )
     args = parser.parse_args()
     
+    if args.cache:
+        enable_cache()
+    
     try:
         formatted_id = format_condition_id(args.market)
     except ValueError as e:
@@ -69,13 +80,13 @@ def main():
     print("=" * 100)
     print()
     
-    holders_data = get_market_holders(args.market, args.limit)
+    holders_data = get_market_holders(formatted_id, args.limit)
     
-    if not holders_data:
+    if holders_data is None:
         print("No holders data found or error occurred.")
         return
     
-    if not isinstance(holders_data, list) or len(holders_data) == 0:
+    if not holders_data:
         print("No holders found.")
         return
     
@@ -12,7 +12,8 @@ Usage:
 import requests
 import argparse
 import sys
-from utils import format_address
+from api_client import SESSION, enable_cache, parse_json, parse_json_list
+from utils import configure_stdout, format_address, make_address_parser
 
 
 def get_portfolio_value(address):
@@ -20,23 +21,21 @@ def get_portfolio_value(address):
     Get total value of user's positions.
     
     Args:
-        address (str): Ethereum wallet address
+        address (str): Wallet address, already formatted with format_address()
     
     Returns:
         float: Total portfolio value in USDC
     """
     url = "https://data-api.polymarket.com/value"
-    params = {"user": format_address(address)}
+    params = {"user": address}
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = parse_json_list(response)
         
         # Response is an array with one object
-        if isinstance(data, list) and len(data) > 0:
-            return data[0].get('value', 0)
-        return 0
+        return data[0].get('value', 0) if data else 0
     except requests.exceptions.RequestException as e:
         print(f"Error fetching portfolio value: {e}")
         return None
@@ -46,15 +45,14 @@ def get_user_positions_count(address):
     """Get count of user's active positions"""
     url = "https://data-api.polymarket.com/positions"
     params = {
-        "user": format_address(address),
+        "user": address,
         "limit": 1  # Just to check if positions exist
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
-        positions = response.json()
-        return len(positions) if isinstance(positions, list) else 0
+        return len(parse_json_list(response))
     except:
         return 0
 
@@ -62,31 +60,33 @@ def get_user_positions_count(address):
 def get_markets_traded_count(address):
     """Get number of markets user has traded"""
     url = "https://data-api.polymarket.com/traded"
-    params = {"user": format_address(address)}
+    params = {"user": address}
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = SESSION.get(url, params=params, timeout=10)
         response.raise_for_status()
-        data = response.json()
+        data = parse_json(response)
         return data.get('traded', 0)
     except:
         return 0
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Get Polymarket portfolio value")
-    parser.add_argument(
-        "--address",
-        type=str,
-        required=True,
-        help="Wallet address (0x...)"
+def main(argv=None):
+    configure_stdout()
+    
+    parser = argparse.ArgumentParser(
+        description="Get Polymarket portfolio value",
+        parents=[make_address_parser()]
     )
     parser.add_argument(
         "--detailed",
         action="store_true",
         help="Show detailed stats (positions count, markets traded)"
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    if args.cache:
+        enable_cache()
     
     try:
         formatted_address = format_address(args.address)
@@ -99,7 +99,7 @@ def main():
     print()
     
     # Get portfolio value
-    value = get_portfolio_value(args.address)
+    value = get_portfolio_value(formatted_address)
     
     if value is None:
         print("Error fetching portfolio value.")
@@ -111,11 +111,11 @@ def main():
         print("\nFetching additional stats...")
         
         # Get positions count
-        positions_count = get_user_positions_count(args.address)
+        positions_count = get_user_positions_count(formatted_address)
         print(f"Active Positions: {positions_count}")
         
         # Get markets traded
-        markets_count = get_markets_traded_count(args.address)
+        markets_count = get_markets_traded_count(formatted_address)
         print(f"Markets Traded: {markets_count}")
         
         # Calculate average position size
@@ -19,13 +19,19 @@ Usage:
     python get_user_activity.py --address 0x... --limit 100
     python get_user_activity.py --address 0x... --type TRADE,REDEEM
     python get_user_activity.py --address 0x... --side BUY
+    python get_user_activity.py --address 0x... --limit 2000
 """
 
 import requests
 import argparse
 import sys
-from datetime import datetime
-from utils import format_address
+import time
+from collections import Counter
+from api_client import SESSION, enable_cache, fetch_pages, parse_json_list
+from utils import configure_stdout, format_address, write_lines, make_address_parser
+
+# Max activities the /activity endpoint returns per request
+MAX_PAGE_SIZE = 500
 
 
 def get_user_activity(
@@ -41,7 +47,7 @@ def get_user_activity(
     Get user's complete activity history.
     
     Args:
-        address (str): Ethereum wallet address
+        address (str): Wallet address, already formatted with format_address()
         limit (int): Number of activities to return (max: 500)
         offset (int): Pagination offset
         activity_types (list): Filter by types: TRADE, SPLIT, MERGE, REDEEM, REWARD, CONVERSION, MAKER_REBATE
@@ -54,7 +60,7 @@ def get_user_activity(
     """
     url = "https://data-api.polymarket.com/activity"
     params = {
-        "user": format_address(address),
+        "user": address,
         "limit": limit,
         "offset": offset,
         "sortBy": sort_by,
@@ -68,127 +74,210 @@ def get_user_activity(
         params["side"] = side
     
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = SESSION.get(url, params=params, timeout=15)
         response.raise_for_status()
-        return response.json()
+        return parse_json_list(response)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching activity: {e}")
         return None
 
 
+def get_all_user_activity(
+    address,
+    total,
+    offset=0,
+    activity_types=None,
+    side=None,
+    sort_by="TIMESTAMP",
+    sort_direction="DESC"
+):
+    """
+    Get more activity than one request allows by fetching pages concurrently.
+    
+    Args:
+        address (str): Wallet address, already formatted with format_address()
+        total (int): Number of activities to return (any size)
+        offset (int): Offset of the first activity
+        activity_types (list): Filter by types (see get_user_activity)
+        side (str): Filter trades by BUY or SELL
+        sort_by (str): Sort field - TIMESTAMP, TOKENS, CASH
+        sort_direction (str): ASC or DESC
+    
+    Returns:
+        list: User's activity, in the same order as single-page requests
+    """
+    def fetch_page(page_offset, limit):
+        return get_user_activity(
+            address, limit, page_offset, activity_types, side, sort_by, sort_direction
+        )
+    
+    return fetch_pages(fetch_page, total, MAX_PAGE_SIZE, start=offset)
+
+
+# Emoji for each known activity type
+TYPE_EMOJIS = {
+    "TRADE": "📊",
+    "SPLIT": "✂️",
+    "MERGE": "🔗",
+    "REDEEM": "💰",
+    "REWARD": "🎁",
+    "CONVERSION": "🔄",
+    "MAKER_REBATE": "💵"
+}
+
+# Pre-formatted labels, so known types need no string formatting per row
+_FORMATTED_TYPES = {t: f"{emoji} {t}" for t, emoji in TYPE_EMOJIS.items()}
+
+
 def format_activity_type(activity_type):
     """Format activity type with emoji"""
-    type_emojis = {
-        "TRADE": "📊",
-        "SPLIT": "✂️",
-        "MERGE": "🔗",
-        "REDEEM": "💰",
-        "REWARD": "🎁",
-        "CONVERSION": "🔄",
-        "MAKER_REBATE": "💵"
+    label = _FORMATTED_TYPES.get(activity_type)
+    return label if label else f"📌 {activity_type}"
+
+
+def _fmt_trade(activity):
+    """Detail lines for a TRADE activity"""
+    side = activity.get('side', 'N/A')
+    size = activity.get('size', 0)
+    price = activity.get('price', 0)
+    side_emoji = "🟢" if side == "BUY" else "🔴"
+    return (
+        f"   {side_emoji} {side}: {size:,.2f} shares @ ${price:.4f}\n"
+        f"   Value: ${size * price:,.2f}"
+    )
+
+
+def _fmt_split_merge(activity):
+    """Detail lines for a SPLIT or MERGE activity"""
+    return f"   Tokens: {activity.get('size', 0):,.2f}\n   USDC: ${activity.get('usdcSize', 0):,.2f}"
+
+
+def _fmt_redeem(activity):
+    """Detail lines for a REDEEM activity"""
+    return (
+        f"   Redeemed: {activity.get('size', 0):,.2f} tokens\n"
+        f"   Received: ${activity.get('usdcSize', 0):,.2f} USDC"
+    )
+
+
+def _fmt_reward(activity):
+    """Detail lines for a REWARD or MAKER_REBATE activity"""
+    return f"   Amount: ${activity.get('usdcSize', 0):,.2f}"
+
+
+# Type-specific detail formatters (types without an entry show no details)
+FORMATTERS = {
+    "TRADE": _fmt_trade,
+    "SPLIT": _fmt_split_merge,
+    "MERGE": _fmt_split_merge,
+    "REDEEM": _fmt_redeem,
+    "REWARD": _fmt_reward,
+    "MAKER_REBATE": _fmt_reward,
+}
+
+
+def format_timestamps(timestamps):
+    """
+    Format Unix timestamps as readable dates in one batch.
+    
+    Each distinct timestamp is formatted only once, since bursts of
+    activity often share the same second. Missing timestamps become 'N/A'.
+    
+    Args:
+        timestamps (list): Unix timestamps (None or 0 if missing)
+    
+    Returns:
+        list: Formatted 'YYYY-MM-DD HH:MM:SS' strings, in input order
+    """
+    strftime, localtime = time.strftime, time.localtime
+    formatted = {
+        ts: strftime('%Y-%m-%d %H:%M:%S', localtime(ts))
+        for ts in set(timestamps) if ts
     }
-    emoji = type_emojis.get(activity_type, "📌")
-    return f"{emoji} {activity_type}"
+    return [formatted.get(ts, 'N/A') for ts in timestamps]
 
 
 def display_activity(activities):
     """Display activity in a readable format"""
-    if not activities or len(activities) == 0:
+    if not activities:
         print("No activity found.")
         return
     
+    # Collect output and write it to stdout in one call
+    lines = []
+    out = lines.append
+    
+    # Pull the type column out once; the summary and the history
+    # loop below both read it instead of re-querying every dict
+    types = [a.get('type', 'UNKNOWN') for a in activities]
+    
     # Group by type
-    type_counts = {}
-    total_volume = 0
+    type_counts = Counter(types)
     
-    for activity in activities:
-        activity_type = activity.get('type', 'UNKNOWN')
-        type_counts[activity_type] = type_counts.get(activity_type, 0) + 1
-        
-        # Calculate volume for trades
-        if activity_type == 'TRADE':
-            size = activity.get('size', 0)
-            price = activity.get('price', 0)
-            total_volume += size * price
+    # Calculate volume for trades
+    total_volume = sum(
+        a.get('size', 0) * a.get('price', 0)
+        for a, activity_type in zip(activities, types) if activity_type == 'TRADE'
+    )
     
-    print(f"\n📊 Activity Summary")
-    print("-" * 100)
-    print(f"Total Activities: {len(activities)}")
-    print(f"\nBreakdown by Type:")
-    for activity_type, count in sorted(type_counts.items(), key=lambda x: x[1], reverse=True):
-        print(f"  {format_activity_type(activity_type)}: {count}")
+    out(f"\n📊 Activity Summary")
+    out("-" * 100)
+    out(f"Total Activities: {len(activities)}")
+    out(f"\nBreakdown by Type:")
+    for activity_type, count in type_counts.most_common():
+        out(f"  {format_activity_type(activity_type)}: {count}")
     
     if total_volume > 0:
-        print(f"\nTotal Trade Volume: ${total_volume:,.2f}")
+        out(f"\nTotal Trade Volume: ${total_volume:,.2f}")
     
-    print("\n" + "=" * 100)
-    print("ACTIVITY HISTORY")
-    print("=" * 100)
+    out("\n" + "=" * 100)
+    out("ACTIVITY HISTORY")
+    out("=" * 100)
     
-    for i, activity in enumerate(activities, 1):
-        activity_type = activity.get('type', 'UNKNOWN')
-        timestamp = activity.get('timestamp')
-        time_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S') if timestamp else 'N/A'
-        
-        print(f"\n{i}. {format_activity_type(activity_type)} | {time_str}")
+    time_strs = format_timestamps([a.get('timestamp') for a in activities])
+    get_formatter = FORMATTERS.get
+    
+    for i, (activity, activity_type, time_str) in enumerate(zip(activities, types, time_strs), 1):
+        get = activity.get
+        out(f"\n{i}. {format_activity_type(activity_type)} | {time_str}")
         
         # Common fields
-        title = activity.get('title', 'Unknown market')
-        print(f"   Market: {title[:70]}")
+        title = get('title', 'Unknown market')
+        out(f"   Market: {title[:70]}")
         
-        if activity.get('outcome'):
-            print(f"   Outcome: {activity.get('outcome')}")
+        outcome = get('outcome')
+        if outcome:
+            out(f"   Outcome: {outcome}")
         
         # Type-specific details
-        if activity_type == 'TRADE':
-            side = activity.get('side', 'N/A')
-            side_emoji = "🟢" if side == "BUY" else "🔴"
-            size = activity.get('size', 0)
-            price = activity.get('price', 0)
-            value = size * price
-            
-            print(f"   {side_emoji} {side}: {size:,.2f} shares @ ${price:.4f}")
-            print(f"   Value: ${value:,.2f}")
-        
-        elif activity_type in ['SPLIT', 'MERGE']:
-            size = activity.get('size', 0)
-            usdc_size = activity.get('usdcSize', 0)
-            print(f"   Tokens: {size:,.2f}")
-            print(f"   USDC: ${usdc_size:,.2f}")
-        
-        elif activity_type == 'REDEEM':
-            size = activity.get('size', 0)
-            usdc_size = activity.get('usdcSize', 0)
-            print(f"   Redeemed: {size:,.2f} tokens")
-            print(f"   Received: ${usdc_size:,.2f} USDC")
-        
-        elif activity_type in ['REWARD', 'MAKER_REBATE']:
-            usdc_size = activity.get('usdcSize', 0)
-            print(f"   Amount: ${usdc_size:,.2f}")
+        formatter = get_formatter(activity_type)
+        if formatter:
+            out(formatter(activity))
         
         # Transaction hash (if available)
-        tx_hash = activity.get('transactionHash')
+        tx_hash = get('transactionHash')
         if tx_hash:
-            print(f"   TX: {tx_hash[:10]}...{tx_hash[-8:]}")
+            out(f"   TX: {tx_hash[:10]}...{tx_hash[-8:]}")
         
         # Add separator every 5 items for readability
         if i % 5 == 0 and i < len(activities):
-            print("   " + "-" * 95)
+            out("   " + "-" * 95)
+    
+    write_lines(lines)
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Get Polymarket user activity")
-    parser.add_argument(
-        "--address",
-        type=str,
-        required=True,
-        help="Wallet address (0x...)"
+def main(argv=None):
+    configure_stdout()
+    
+    parser = argparse.ArgumentParser(
+        description="Get Polymarket user activity",
+        parents=[make_address_parser()]
     )
     parser.add_argument(
         "--limit",
         type=int,
         default=50,
-        help="Max activities to fetch (default: 50, max: 500)"
+        help="Max activities to fetch (default: 50; above 500, pages are fetched concurrently)"
     )
     parser.add_argument(
         "--offset",
@@ -221,7 +310,10 @@ def main():
         choices=["ASC", "DESC"],
         help="Sort direction (default: DESC)"
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    if args.cache:
+        enable_cache()
     
     try:
         formatted_address = format_address(args.address)
@@ -241,8 +333,10 @@ def main():
     if args.side:
         print(f"   Side: {args.side}")
     
-    activities = get_user_activity(
-        args.address,
+    # Larger requests are split into pages fetched concurrently
+    fetch = get_all_user_activity if args.limit > MAX_PAGE_SIZE else get_user_activity
+    activities = fetch(
+        formatted_address,
         args.limit,
         args.offset,
         activity_types,
@@ -20,7 +20,8 @@ Usage:
 import requests
 import argparse
 import sys
-from utils import format_address, format_pnl, format_percentage
+from api_client import SESSION, enable_cache, parse_json_list
+from utils import configure_stdout, format_address, format_pnl, format_percentage, write_lines, make_address_parser
 
 
 def get_user_positions(address, limit=20, sort_by="CURRENT", sort_direction="DESC", redeemable=None):
@@ -28,7 +29,7 @@ def get_user_positions(address, limit=20, sort_by="CURRENT", sort_direction="DES
     Get user's positions with P&L.
     
     Args:
-        address (str): Ethereum wallet address
+        address (str): Wallet address, already formatted with format_address()
         limit (int): Number of positions to return (max: 500)
         sort_by (str): Sort field - CURRENT, CASHPNL, PERCENTPNL, TITLE, PRICE
         sort_direction (str): ASC or DESC
@@ -42,7 +43,7 @@ def get_user_positions(address, limit=20, sort_by="CURRENT", sort_direction="DES
     """
     url = "https://data-api.polymarket.com/positions"
     params = {
-        "user": format_address(address),
+        "user": address,
         "limit": limit,
         "sortBy": sort_by,
         "sortDirection": sort_direction
@@ -52,21 +53,20 @@ def get_user_positions(address, limit=20, sort_by="CURRENT", sort_direction="DES
         params["redeemable"] = str(redeemable).lower()
     
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = SESSION.get(url, params=params, timeout=15)
         response.raise_for_status()
-        return response.json()
+        return parse_json_list(response)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching positions: {e}")
         return None
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Get Polymarket user positions")
-    parser.add_argument(
-        "--address",
-        type=str,
-        required=True,
-        help="Wallet address (0x...)"
+def main(argv=None):
+    configure_stdout()
+    
+    parser = argparse.ArgumentParser(
+        description="Get Polymarket user positions",
+        parents=[make_address_parser()]
     )
     parser.add_argument(
         "--limit",
@@ -98,7 +98,10 @@ def main():
         action="store_true",
         help="Include positions with CLAIMABLE PAYOUTS (redeemable=true)"
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    if args.cache:
+        enable_cache()
     
     # Validate mutually exclusive options
     if args.active_only and args.include_payouts:
@@ -126,71 +129,70 @@ def main():
     print("=" * 100)
     print()
     positions = get_user_positions(
-        args.address,
+        formatted_address,
         args.limit,
         args.sort,
         args.direction,
         redeemable
     )
     
-    if not positions:
+    if positions is None:
         print("No positions found or error occurred.")
         return
     
-    if not isinstance(positions, list) or len(positions) == 0:
+    if not positions:
         print("No active positions.")
         return
     
-    # Calculate totals
-    total_value = sum(p.get('currentValue', 0) for p in positions)
-    total_pnl = sum(p.get('cashPnl', 0) for p in positions)
-    
-    print(f"Total Positions: {len(positions)}")
-    print(f"Total Value: ${total_value:,.2f}")
-    print(f"Total Unrealized P&L: {format_pnl(total_pnl)}")
-    print()
-    print("=" * 100)
+    # Render every position and accumulate the totals in the same pass,
+    # then print the summary header followed by the rendered rows
+    total_value = 0
+    total_pnl = 0
+    lines = []
+    out = lines.append
     
     for i, position in enumerate(positions, 1):
-        print(f"\n{i}. {position['title']}")
-        print(f"   Market: {position.get('slug', 'N/A')}")
-        print(f"   Outcome: {position['outcome']} (vs {position.get('oppositeOutcome', 'N/A')})")
-        
-        # Position size and prices
-        size = position.get('size', 0)
-        avg_price = position.get('avgPrice', 0)
-        cur_price = position.get('curPrice', 0)
-        
-        print(f"\n   Size: {size:,.2f} shares")
-        print(f"   Avg Price: ${avg_price:.4f}")
-        print(f"   Current Price: ${cur_price:.4f}")
+        get = position.get
+        current_value = get('currentValue', 0)
+        cash_pnl = get('cashPnl', 0)
+        total_value += current_value
+        total_pnl += cash_pnl
         
-        # P&L
-        initial_value = position.get('initialValue', 0)
-        current_value = position.get('currentValue', 0)
-        cash_pnl = position.get('cashPnl', 0)
-        percent_pnl = position.get('percentPnl', 0)
-        
-        print(f"\n   Initial Value: ${initial_value:,.2f}")
-        print(f"   Current Value: ${current_value:,.2f}")
-        print(f"   Unrealized P&L: {format_pnl(cash_pnl)} ({format_percentage(percent_pnl)})")
+        out(
+            f"\n{i}. {position['title']}\n"
+            f"   Market: {get('slug', 'N/A')}\n"
+            f"   Outcome: {position['outcome']} (vs {get('oppositeOutcome', 'N/A')})\n"
+            f"\n   Size: {get('size', 0):,.2f} shares\n"
+            f"   Avg Price: ${get('avgPrice', 0):.4f}\n"
+            f"   Current Price: ${get('curPrice', 0):.4f}\n"
+            f"\n   Initial Value: ${get('initialValue', 0):,.2f}\n"
+            f"   Current Value: ${current_value:,.2f}\n"
+            f"   Unrealized P&L: {format_pnl(cash_pnl)} ({format_percentage(get('percentPnl', 0))})"
+        )
         
         # Realized P&L (if any)
-        realized_pnl = position.get('realizedPnl')
+        realized_pnl = get('realizedPnl')
         if realized_pnl and realized_pnl != 0:
-            percent_realized = position.get('percentRealizedPnl', 0)
-            print(f"   Realized P&L: {format_pnl(realized_pnl)} ({format_percentage(percent_realized)})")
+            percent_realized = get('percentRealizedPnl', 0)
+            out(f"   Realized P&L: {format_pnl(realized_pnl)} ({format_percentage(percent_realized)})")
         
         # Status
-        if position.get('redeemable'):
-            print(f"\n   Status: ✓ Redeemable")
-        elif position.get('mergeable'):
-            print(f"\n   Status: ⚡ Mergeable")
+        if get('redeemable'):
+            out(f"\n   Status: ✓ Redeemable")
+        elif get('mergeable'):
+            out(f"\n   Status: ⚡ Mergeable")
         
         # End date
-        end_date = position.get('endDate')
+        end_date = get('endDate')
         if end_date:
-            print(f"   Ends: {end_date}")
+            out(f"   Ends: {end_date}")
+    
+    print(f"Total Positions: {len(positions)}")
+    print(f"Total Value: ${total_value:,.2f}")
+    print(f"Total Unrealized P&L: {format_pnl(total_pnl)}")
+    print()
+    print("=" * 100)
+    write_lines(lines)
 
 
 if __name__ == "__main__":
@@ -14,8 +14,10 @@ Usage:
 import requests
 import argparse
 import sys
-from datetime import datetime
-from utils import format_address
+import time
+from functools import lru_cache
+from api_client import SESSION, enable_cache, parse_json_list
+from utils import configure_stdout, format_address, write_lines, make_address_parser
 
 
 def get_user_trades(address, limit=50, side=None, market=None):
@@ -23,7 +25,7 @@ def get_user_trades(address, limit=50, side=None, market=None):
     Get user's trade history.
     
     Args:
-        address (str): Ethereum wallet address
+        address (str): Wallet address, already formatted with format_address()
         limit (int): Number of trades to return (max: 10000)
         side (str): Filter by BUY or SELL (None = both)
         market (str): Filter by condition ID (optional)
@@ -33,7 +35,7 @@ def get_user_trades(address, limit=50, side=None, market=None):
     """
     url = "https://data-api.polymarket.com/trades"
     params = {
-        "user": format_address(address),
+        "user": address,
         "limit": limit
     }
     
@@ -44,28 +46,32 @@ def get_user_trades(address, limit=50, side=None, market=None):
         params["market"] = market
     
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = SESSION.get(url, params=params, timeout=15)
         response.raise_for_status()
-        return response.json()
+        return parse_json_list(response)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching trades: {e}")
         return None
 
 
+@lru_cache(maxsize=4096)
 def format_timestamp(timestamp):
-    """Convert Unix timestamp to readable date"""
+    """
+    Convert Unix timestamp to readable date
+    
+    Cached, since fills of one order often share the same second.
+    """
     if timestamp:
-        return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))
     return "N/A"
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Get Polymarket user trading history")
-    parser.add_argument(
-        "--address",
-        type=str,
-        required=True,
-        help="Wallet address (0x...)"
+def main(argv=None):
+    configure_stdout()
+    
+    parser = argparse.ArgumentParser(
+        description="Get Polymarket user trading history",
+        parents=[make_address_parser()]
     )
     parser.add_argument(
         "--limit",
@@ -80,7 +86,10 @@ def main():
         choices=["BUY", "SELL", "buy", "sell"],
         help="Filter by trade side (BUY or SELL)"
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    if args.cache:
+        enable_cache()
     
     try:
         formatted_address = format_address(args.address)
@@ -95,13 +104,13 @@ def main():
     print("=" * 100)
     print()
     
-    trades = get_user_trades(args.address, args.limit, side_filter)
+    trades = get_user_trades(formatted_address, args.limit, side_filter)
     
-    if not trades:
+    if trades is None:
         print("No trades found or error occurred.")
         return
     
-    if not isinstance(trades, list) or len(trades) == 0:
+    if not trades:
         print("No trading history.")
         return
     
@@ -117,37 +126,41 @@ def main():
     print()
     print("=" * 100)
     
+    lines = []
+    out = lines.append
+    
     for i, trade in enumerate(trades, 1):
-        side = trade.get('side', 'UNKNOWN')
-        side_emoji = "🟢" if side == "BUY" else "🔴"
-        
-        print(f"\n{i}. {side_emoji} {side}: {trade['title']}")
-        print(f"   Market: {trade.get('slug', 'N/A')}")
-        print(f"   Outcome: {trade.get('outcome', 'N/A')}")
+        get = trade.get
+        side = get('side', 'UNKNOWN')
+        size = get('size', 0)
+        price = get('price', 0)
         
-        # Trade details
-        size = trade.get('size', 0)
-        price = trade.get('price', 0)
-        total_value = size * price
-        
-        print(f"\n   Size: {size:,.2f} shares")
-        print(f"   Price: ${price:.4f}")
-        print(f"   Total: ${total_value:,.2f}")
+        side_emoji = "🟢" if side == "BUY" else "🔴"
+        out(
+            f"\n{i}. {side_emoji} {side}: {trade['title']}\n"
+            f"   Market: {get('slug', 'N/A')}\n"
+            f"   Outcome: {get('outcome', 'N/A')}\n"
+            f"\n   Size: {size:,.2f} shares\n"
+            f"   Price: ${price:.4f}\n"
+            f"   Total: ${size * price:,.2f}"
+        )
         
         # Timestamp
-        timestamp = trade.get('timestamp')
+        timestamp = get('timestamp')
         if timestamp:
-            print(f"   Time: {format_timestamp(timestamp)}")
+            out(f"   Time: {format_timestamp(timestamp)}")
         
         # Transaction hash
-        tx_hash = trade.get('transactionHash')
+        tx_hash = get('transactionHash')
         if tx_hash:
-            print(f"   TX: {tx_hash[:10]}...{tx_hash[-8:]}")
+            out(f"   TX: {tx_hash[:10]}...{tx_hash[-8:]}")
         
         # Trader info (if available)
-        username = trade.get('name') or trade.get('pseudonym')
+        username = get('name') or get('pseudonym')
         if username:
-            print(f"   Trader: {username}")
+            out(f"   Trader: {username}")
+    
+    write_lines(lines)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Example: Run a wallet script for several addresses in one process
+
+Each example script can be run on its own, but looping over wallets in
+the shell pays Python startup, imports and a new HTTPS connection for
+every address. This entry point runs the chosen script's main() once per
+address inside a single interpreter, sharing the keep-alive session.
+
+Usage:
+    python poly.py positions 0xADDRESS1 0xADDRESS2 --limit 10
+    python poly.py trades 0xADDRESS1 0xADDRESS2 --side BUY
+    python poly.py analysis 0xADDRESS1 0xADDRESS2 --cache
+
+Options after the addresses are passed through to the script.
+"""
+
+import argparse
+import importlib
+import sys
+
+
+# Subcommand -> example script module (each exposes main(argv))
+COMMANDS = {
+    "positions": "get_user_positions",
+    "trades": "get_user_trades",
+    "activity": "get_user_activity",
+    "value": "get_portfolio_value",
+    "trader": "analyze_trader",
+    "analysis": "trade_analysis",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run a wallet example script for one or more addresses",
+        epilog="Any other options are passed through to the script, e.g. --limit 10"
+    )
+    parser.add_argument(
+        "command",
+        choices=COMMANDS,
+        help="Script to run"
+    )
+    parser.add_argument(
+        "addresses",
+        nargs="+",
+        help="Wallet addresses (0x...)"
+    )
+    args, script_args = parser.parse_known_args()
+    
+    script = importlib.import_module(COMMANDS[args.command])
+    
+    failed = 0
+    for address in args.addresses:
+        try:
+            script.main(["--address", address, *script_args])
+        except SystemExit as e:
+            # Scripts exit on invalid input; report it and move on
+            if e.code:
+                failed += 1
+        print()
+    
+    if failed:
+        print(f"{failed} of {len(args.addresses)} address(es) failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,8 +11,38 @@ The redeemable parameter is crucial for understanding what positions
 a user has and whether they have unclaimed payouts from resolved markets.
 """
 
-import requests
-from utils import format_address
+from concurrent.futures import ThreadPoolExecutor
+from api_client import SESSION, parse_json
+from utils import configure_stdout, format_address
+
+
+POSITIONS_URL = "https://data-api.polymarket.com/positions"
+
+
+def fetch_positions(address, redeemable=None):
+    """
+    Fetch positions with an optional redeemable filter
+    
+    Args:
+        address (str): Formatted wallet address
+        redeemable (str): "true", "false", or None to omit the parameter
+    
+    Returns:
+        requests.Response: Raw response
+    """
+    params = {
+        "user": address,
+        "sizeThreshold": 1,
+        "limit": 100,
+        "sortBy": "TOKENS",
+        "sortDirection": "DESC"
+    }
+    
+    # No redeemable parameter = get everything
+    if redeemable is not None:
+        params["redeemable"] = redeemable
+    
+    return SESSION.get(POSITIONS_URL, params=params)
 
 
 def get_positions_comparison(address):
@@ -22,29 +52,25 @@ def get_positions_comparison(address):
     Args:
         address (str): Wallet address to analyze
     """
-    base_url = "https://data-api.polymarket.com/positions"
     formatted_addr = format_address(address)
     
     print(f"Comparing position queries for: {formatted_addr}")
     print("=" * 80)
     
+    # The three queries are independent, so send them all at once and
+    # print the results afterwards
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        active_response, redeemable_response, all_response = executor.map(
+            lambda redeemable: fetch_positions(formatted_addr, redeemable),
+            ["false", "true", None]
+        )
+    
     # Query 1: Active positions only (redeemable=false)
     print("\n1️⃣  ACTIVE POSITIONS ONLY (redeemable=false)")
     print("-" * 80)
-    response = requests.get(
-        base_url,
-        params={
-            "user": formatted_addr,
-            "sizeThreshold": 1,
-            "limit": 100,
-            "sortBy": "TOKENS",
-            "sortDirection": "DESC",
-            "redeemable": "false"  # Only current active positions
-        }
-    )
-    
-    if response.ok:
-        active = response.json()
+    
+    if active_response.ok:
+        active = parse_json(active_response)
         print(f"Found {len(active)} active position(s)")
         if active:
             total_value = sum(p.get('currentValue', 0) for p in active)
@@ -54,25 +80,14 @@ def get_positions_comparison(address):
                 print(f"  - {p.get('title', 'N/A')[:60]}")
                 print(f"    Value: ${p.get('currentValue', 0):,.2f}, Redeemable: {p.get('redeemable', False)}")
     else:
-        print(f"Error: {response.status_code}")
+        print(f"Error: {active_response.status_code}")
     
     # Query 2: Redeemable positions (old positions with payouts)
     print("\n\n2️⃣  CLAIMABLE PAYOUTS (redeemable=true)")
     print("-" * 80)
-    response = requests.get(
-        base_url,
-        params={
-            "user": formatted_addr,
-            "sizeThreshold": 1,
-            "limit": 100,
-            "sortBy": "TOKENS",
-            "sortDirection": "DESC",
-            "redeemable": "true"  # Old positions with payouts left
-        }
-    )
-    
-    if response.ok:
-        redeemable = response.json()
+    
+    if redeemable_response.ok:
+        redeemable = parse_json(redeemable_response)
         print(f"Found {len(redeemable)} redeemable position(s)")
         if redeemable:
             total_claimable = sum(p.get('currentValue', 0) for p in redeemable)
@@ -82,25 +97,14 @@ def get_positions_comparison(address):
                 print(f"  - {p.get('title', 'N/A')[:60]}")
                 print(f"    Claimable: ${p.get('currentValue', 0):,.2f}, Redeemable: {p.get('redeemable', False)}")
     else:
-        print(f"Error: {response.status_code}")
+        print(f"Error: {redeemable_response.status_code}")
     
     # Query 3: ALL positions (no redeemable filter)
     print("\n\n3️⃣  ALL POSITIONS (no redeemable parameter)")
     print("-" * 80)
-    response = requests.get(
-        base_url,
-        params={
-            "user": formatted_addr,
-            "sizeThreshold": 1,
-            "limit": 100,
-            "sortBy": "TOKENS",
-            "sortDirection": "DESC"
-            # No redeemable parameter = get everything
-        }
-    )
-    
-    if response.ok:
-        all_positions = response.json()
+    
+    if all_response.ok:
+        all_positions = parse_json(all_response)
         print(f"Found {len(all_positions)} total position(s)")
         if all_positions:
             total_all = sum(p.get('currentValue', 0) for p in all_positions)
@@ -117,7 +121,7 @@ def get_positions_comparison(address):
                 print(f"  {status}: {p.get('title', 'N/A')[:50]}")
                 print(f"    Value: ${p.get('currentValue', 0):,.2f}")
     else:
-        print(f"Error: {response.status_code}")
+        print(f"Error: {all_response.status_code}")
     
     # Summary
     print("\n\n" + "=" * 80)
@@ -144,6 +148,8 @@ When to use each parameter:
 
 
 if __name__ == "__main__":
+    configure_stdout()
+    
     # Example addresses (replace with actual address)
     test_addresses = [
         "0x742d35cc6634c0532925a3b844bc9e7595f0bee",
@@ -17,8 +17,45 @@ Usage:
 import requests
 import argparse
 import sys
-from collections import defaultdict
-from utils import format_address
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from heapq import nlargest, nsmallest
+from api_client import SESSION, enable_cache, fetch_pages, parse_json_list
+from utils import configure_stdout, format_address, write_lines, make_address_parser
+
+
+# Largest page /trades returns. Limits up to this are one request; only
+# larger ones are split into pages of this size, fetched concurrently.
+TRADES_PAGE_SIZE = 10000
+
+
+def fetch_trades_page(address, offset, limit):
+    """
+    Fetch one page of a user's taker trades
+    
+    Args:
+        address (str): Wallet address, already formatted with format_address()
+        offset (int): Offset of the first trade
+        limit (int): Number of trades in the page
+    
+    Returns:
+        list: Trades, newest first
+    
+    Raises:
+        requests.exceptions.RequestException: If the request fails
+    """
+    response = SESSION.get(
+        "https://data-api.polymarket.com/trades",
+        params={
+            "user": address,
+            "limit": limit,
+            "offset": offset,
+            "takerOnly": "true"
+        },
+        timeout=20
+    )
+    response.raise_for_status()
+    return parse_json_list(response)
 
 
 def analyze_trades(address, limit=500):
@@ -26,72 +63,70 @@ def analyze_trades(address, limit=500):
     Analyze all trades to find buy high/sell low patterns
     
     Args:
-        address (str): Wallet address
+        address (str): Wallet address, already formatted with format_address()
         limit (int): Number of trades to analyze
     
     Returns:
         dict: Trade analysis statistics
     """
-    url = "https://data-api.polymarket.com/trades"
-    
     try:
-        response = requests.get(
-            url,
-            params={
-                "user": format_address(address),
-                "limit": limit,
-                "takerOnly": "true"
-            },
-            timeout=20
-        )
-        response.raise_for_status()
-        trades = response.json()
+        trades = fetch_pages(partial(fetch_trades_page, address), limit, TRADES_PAGE_SIZE)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching trades: {e}")
         return None
     
-    # Group trades by market
-    market_trades = defaultdict(list)
+    # Accumulate per-market buy/sell totals in a single pass - only the
+    # counts and sums are needed, so trades are never grouped or sorted
+    markets = {}
     for trade in trades:
-        condition_id = trade.get('conditionId')
-        if condition_id:
-            market_trades[condition_id].append(trade)
+        get = trade.get
+        condition_id = get('conditionId')
+        if not condition_id:
+            continue
+        
+        market = markets.get(condition_id)
+        if market is None:
+            market = markets[condition_id] = {
+                'title': get('title', 'Unknown'),
+                'BUY': [0, 0, 0],  # count, price sum, size sum
+                'SELL': [0, 0, 0]
+            }
+        
+        totals = market.get(get('side'))
+        if totals is not None:
+            totals[0] += 1
+            totals[1] += get('price', 0)
+            totals[2] += get('size', 0)
     
     # Analyze each market
     failed_trades = []
     
-    for condition_id, trades_list in market_trades.items():
-        # Sort by timestamp
-        trades_list.sort(key=lambda x: x.get('timestamp', 0))
-        
-        buys = [t for t in trades_list if t.get('side') == 'BUY']
-        sells = [t for t in trades_list if t.get('side') == 'SELL']
+    for market in markets.values():
+        buy_count, buy_price_sum, total_bought = market['BUY']
+        sell_count, sell_price_sum, total_sold = market['SELL']
         
-        if buys and sells:
+        if buy_count and sell_count:
             # Calculate average buy and sell price
-            avg_buy = sum(t.get('price', 0) for t in buys) / len(buys)
-            avg_sell = sum(t.get('price', 0) for t in sells) / len(sells)
+            avg_buy = buy_price_sum / buy_count
+            avg_sell = sell_price_sum / sell_count
             
             # Check if bought high and sold low
             if avg_sell < avg_buy:
-                total_bought = sum(t.get('size', 0) for t in buys)
-                total_sold = sum(t.get('size', 0) for t in sells)
-                
                 loss = (avg_buy - avg_sell) * min(total_bought, total_sold)
                 
                 failed_trades.append({
-                    'title': trades_list[0].get('title', 'Unknown'),
+                    'title': market['title'],
                     'avg_buy': avg_buy,
                     'avg_sell': avg_sell,
                     'loss': loss,
-                    'buy_count': len(buys),
-                    'sell_count': len(sells)
+                    'buy_count': buy_count,
+                    'sell_count': sell_count
                 })
     
     return {
         'total_trades': len(trades),
         'failed_trades': failed_trades,
-        'markets_traded': len(market_trades)
+        'markets_traded': len(markets)
     }
 
 
@@ -100,7 +135,7 @@ def analyze_closed_positions(address, limit=50):
     Analyze closed positions to find won/lost bets
     
     Args:
-        address (str): Wallet address
+        address (str): Wallet address, already formatted with format_address()
         limit (int): Number of closed positions to check
     
     Returns:
@@ -109,10 +144,10 @@ def analyze_closed_positions(address, limit=50):
     url = "https://data-api.polymarket.com/closed-positions"
     
     try:
-        response = requests.get(
+        response = SESSION.get(
             url,
             params={
-                "user": format_address(address),
+                "user": address,
                 "limit": limit,
                 "sortBy": "TIMESTAMP",
                 "sortDirection": "DESC"
@@ -120,24 +155,25 @@ def analyze_closed_positions(address, limit=50):
             timeout=15
         )
         response.raise_for_status()
-        positions = response.json()
+        positions = parse_json_list(response)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching closed positions: {e}")
         return None
     
     won_bets = []
     lost_bets = []
+    total_won = 0
+    total_lost = 0
     
     for pos in positions:
         realized_pnl = pos.get('realizedPnl', 0)
         
         if realized_pnl > 0:
             won_bets.append(pos)
+            total_won += realized_pnl
         elif realized_pnl < 0:
             lost_bets.append(pos)
-    
-    total_won = sum(p.get('realizedPnl', 0) for p in won_bets)
-    total_lost = sum(p.get('realizedPnl', 0) for p in lost_bets)
+            total_lost += realized_pnl
     
     return {
         'total_closed': len(positions),
@@ -156,7 +192,7 @@ def analyze_open_positions(address, limit=100):
     Analyze open positions to find current winners/losers
     
     Args:
-        address (str): Wallet address
+        address (str): Wallet address, already formatted with format_address()
         limit (int): Number of positions to check
     
     Returns:
@@ -165,26 +201,35 @@ def analyze_open_positions(address, limit=100):
     url = "https://data-api.polymarket.com/positions"
     
     try:
-        response = requests.get(
+        response = SESSION.get(
             url,
             params={
-                "user": format_address(address),
+                "user": address,
                 "limit": limit,
                 "redeemable": "false"  # Active only
             },
             timeout=15
         )
         response.raise_for_status()
-        positions = response.json()
+        positions = parse_json_list(response)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching open positions: {e}")
         return None
     
-    winning = [p for p in positions if p.get('cashPnl', 0) > 0]
-    losing = [p for p in positions if p.get('cashPnl', 0) < 0]
+    winning = []
+    losing = []
+    total_unrealized_gain = 0
+    total_unrealized_loss = 0
     
-    total_unrealized_gain = sum(p.get('cashPnl', 0) for p in winning)
-    total_unrealized_loss = sum(p.get('cashPnl', 0) for p in losing)
+    for pos in positions:
+        cash_pnl = pos.get('cashPnl', 0)
+        
+        if cash_pnl > 0:
+            winning.append(pos)
+            total_unrealized_gain += cash_pnl
+        elif cash_pnl < 0:
+            losing.append(pos)
+            total_unrealized_loss += cash_pnl
     
     return {
         'total_open': len(positions),
@@ -201,105 +246,109 @@ def analyze_open_positions(address, limit=100):
 def display_analysis(trade_stats, closed_stats, open_stats, address):
     """Display comprehensive trade analysis"""
     
-    print("=" * 100)
-    print("COMPREHENSIVE TRADE WIN/LOSS ANALYSIS")
-    print("=" * 100)
-    print(f"\nTrader: {address}\n")
+    # Collect the report and write it once instead of one print per line
+    lines = []
+    out = lines.append
+    
+    out("=" * 100)
+    out("COMPREHENSIVE TRADE WIN/LOSS ANALYSIS")
+    out("=" * 100)
+    out(f"\nTrader: {address}\n")
     
     # CLOSED POSITIONS (Realized P&L)
-    print("=" * 100)
-    print("1. CLOSED POSITIONS (Realized P&L)")
-    print("=" * 100)
+    out("=" * 100)
+    out("1. CLOSED POSITIONS (Realized P&L)")
+    out("=" * 100)
     
     if closed_stats:
-        print(f"\nTotal Closed Positions: {closed_stats['total_closed']}")
-        print(f"  ✅ WON:  {closed_stats['win_count']} positions (+${closed_stats['total_won']:.2f})")
-        print(f"  ❌ LOST: {closed_stats['loss_count']} positions (${closed_stats['total_lost']:.2f})")
-        print(f"  📊 NET:  ${closed_stats['net_pnl']:+.2f}")
+        out(f"\nTotal Closed Positions: {closed_stats['total_closed']}")
+        out(f"  ✅ WON:  {closed_stats['win_count']} positions (+${closed_stats['total_won']:.2f})")
+        out(f"  ❌ LOST: {closed_stats['loss_count']} positions (${closed_stats['total_lost']:.2f})")
+        out(f"  📊 NET:  ${closed_stats['net_pnl']:+.2f}")
         
         if closed_stats['total_closed'] > 0:
             win_rate = (closed_stats['win_count'] / closed_stats['total_closed'] * 100)
-            print(f"  🎯 Win Rate: {win_rate:.1f}%")
+            out(f"  🎯 Win Rate: {win_rate:.1f}%")
         
         # Show worst losses
         if closed_stats['lost_bets']:
-            print(f"\n❌ TOP 10 LOST BETS (worst losses):")
-            print("-" * 100)
-            sorted_losses = sorted(closed_stats['lost_bets'], key=lambda x: x.get('realizedPnl', 0))[:10]
+            out(f"\n❌ TOP 10 LOST BETS (worst losses):")
+            out("-" * 100)
+            sorted_losses = nsmallest(10, closed_stats['lost_bets'], key=lambda x: x.get('realizedPnl', 0))
             for i, bet in enumerate(sorted_losses, 1):
                 pnl = bet.get('realizedPnl', 0)
                 title = bet.get('title', 'Unknown')[:60]
                 avg_price = bet.get('avgPrice', 0)
-                print(f"{i:2}. ${pnl:+7.2f} | Avg Buy: ${avg_price:.3f} | {title}")
+                out(f"{i:2}. ${pnl:+7.2f} | Avg Buy: ${avg_price:.3f} | {title}")
         
         # Show best wins
         if closed_stats['won_bets']:
-            print(f"\n✅ TOP 10 WON BETS (best wins):")
-            print("-" * 100)
-            sorted_wins = sorted(closed_stats['won_bets'], key=lambda x: x.get('realizedPnl', 0), reverse=True)[:10]
+            out(f"\n✅ TOP 10 WON BETS (best wins):")
+            out("-" * 100)
+            sorted_wins = nlargest(10, closed_stats['won_bets'], key=lambda x: x.get('realizedPnl', 0))
             for i, bet in enumerate(sorted_wins, 1):
                 pnl = bet.get('realizedPnl', 0)
                 title = bet.get('title', 'Unknown')[:60]
                 avg_price = bet.get('avgPrice', 0)
-                print(f"{i:2}. ${pnl:+7.2f} | Avg Buy: ${avg_price:.3f} | {title}")
+                out(f"{i:2}. ${pnl:+7.2f} | Avg Buy: ${avg_price:.3f} | {title}")
     
     # OPEN POSITIONS (Unrealized P&L)
-    print("\n" + "=" * 100)
-    print("2. OPEN POSITIONS (Unrealized P&L)")
-    print("=" * 100)
+    out("\n" + "=" * 100)
+    out("2. OPEN POSITIONS (Unrealized P&L)")
+    out("=" * 100)
     
     if open_stats:
-        print(f"\nTotal Open Positions: {open_stats['total_open']}")
-        print(f"  📈 Currently Winning: {open_stats['winning_count']} (+${open_stats['unrealized_gain']:.2f})")
-        print(f"  📉 Currently Losing:  {open_stats['losing_count']} (${open_stats['unrealized_loss']:.2f})")
-        print(f"  📊 NET Unrealized:    ${open_stats['net_unrealized']:+.2f}")
+        out(f"\nTotal Open Positions: {open_stats['total_open']}")
+        out(f"  📈 Currently Winning: {open_stats['winning_count']} (+${open_stats['unrealized_gain']:.2f})")
+        out(f"  📉 Currently Losing:  {open_stats['losing_count']} (${open_stats['unrealized_loss']:.2f})")
+        out(f"  📊 NET Unrealized:    ${open_stats['net_unrealized']:+.2f}")
         
         # Show biggest unrealized losses
         if open_stats['losing_positions']:
-            print(f"\n📉 BIGGEST UNREALIZED LOSSES (top 10):")
-            print("-" * 100)
-            sorted_losing = sorted(open_stats['losing_positions'], key=lambda x: x.get('cashPnl', 0))[:10]
+            out(f"\n📉 BIGGEST UNREALIZED LOSSES (top 10):")
+            out("-" * 100)
+            sorted_losing = nsmallest(10, open_stats['losing_positions'], key=lambda x: x.get('cashPnl', 0))
             for i, pos in enumerate(sorted_losing, 1):
                 pnl = pos.get('cashPnl', 0)
                 title = pos.get('title', 'Unknown')[:50]
                 size = pos.get('size', 0)
                 avg_price = pos.get('avgPrice', 0)
                 cur_price = pos.get('curPrice', 0)
-                print(f"{i:2}. ${pnl:+7.2f} | {size:.0f} shares | Buy ${avg_price:.3f} → Now ${cur_price:.3f} | {title}")
+                out(f"{i:2}. ${pnl:+7.2f} | {size:.0f} shares | Buy ${avg_price:.3f} → Now ${cur_price:.3f} | {title}")
     
     # FAILED TRADES (Buy High, Sell Low)
-    print("\n" + "=" * 100)
-    print("3. FAILED TRADES (Bought High, Sold Low)")
-    print("=" * 100)
+    out("\n" + "=" * 100)
+    out("3. FAILED TRADES (Bought High, Sold Low)")
+    out("=" * 100)
     
     if trade_stats and trade_stats['failed_trades']:
-        print(f"\nMarkets where trader BOUGHT HIGH and SOLD LOW: {len(trade_stats['failed_trades'])}")
-        print("-" * 100)
+        out(f"\nMarkets where trader BOUGHT HIGH and SOLD LOW: {len(trade_stats['failed_trades'])}")
+        out("-" * 100)
         
-        sorted_failed = sorted(trade_stats['failed_trades'], key=lambda x: x['loss'], reverse=True)[:15]
+        sorted_failed = nlargest(15, trade_stats['failed_trades'], key=lambda x: x['loss'])
         for i, trade in enumerate(sorted_failed, 1):
             loss = trade['loss']
             avg_buy = trade['avg_buy']
             avg_sell = trade['avg_sell']
             title = trade['title'][:55]
-            print(f"{i:2}. Loss: ${loss:.2f} | Buy ${avg_buy:.3f} → Sell ${avg_sell:.3f} | {title}")
+            out(f"{i:2}. Loss: ${loss:.2f} | Buy ${avg_buy:.3f} → Sell ${avg_sell:.3f} | {title}")
     else:
-        print("\nNo failed trades found (or insufficient trade data)")
+        out("\nNo failed trades found (or insufficient trade data)")
     
     # OVERALL SUMMARY
-    print("\n" + "=" * 100)
-    print("OVERALL SUMMARY")
-    print("=" * 100)
+    out("\n" + "=" * 100)
+    out("OVERALL SUMMARY")
+    out("=" * 100)
     
     total_realized = closed_stats['net_pnl'] if closed_stats else 0
     total_unrealized = open_stats['net_unrealized'] if open_stats else 0
     total_pnl = total_realized + total_unrealized
     
-    print(f"\n💰 TOTAL P&L:")
-    print(f"  Realized (closed):   ${total_realized:+.2f}")
-    print(f"  Unrealized (open):   ${total_unrealized:+.2f}")
-    print(f"  ─────────────────────────────")
-    print(f"  TOTAL:               ${total_pnl:+.2f}")
+    out(f"\n💰 TOTAL P&L:")
+    out(f"  Realized (closed):   ${total_realized:+.2f}")
+    out(f"  Unrealized (open):   ${total_unrealized:+.2f}")
+    out(f"  ─────────────────────────────")
+    out(f"  TOTAL:               ${total_pnl:+.2f}")
     
     if total_pnl > 0:
         verdict = "✅ PROFITABLE"
@@ -308,7 +357,7 @@ def display_analysis(trade_stats, closed_stats, open_stats, address):
     else:
         verdict = "⚖️  BREAK EVEN"
     
-    print(f"\n🎯 VERDICT: {verdict}")
+    out(f"\n🎯 VERDICT: {verdict}")
     
     # Win rate
     if closed_stats and closed_stats['total_closed'] > 0:
@@ -318,17 +367,18 @@ def display_analysis(trade_stats, closed_stats, open_stats, address):
         
         if total_resolved > 0:
             win_rate = (total_wins / total_resolved * 100)
-            print(f"📊 Win Rate (Closed): {win_rate:.1f}% ({total_wins}W / {total_losses}L)")
+            out(f"📊 Win Rate (Closed): {win_rate:.1f}% ({total_wins}W / {total_losses}L)")
     
-    print("\n" + "=" * 100)
+    out("\n" + "=" * 100)
+    write_lines(lines)
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Analyze trader win/loss performance")
-    parser.add_argument(
-        "--address",
-        type=str,
-        help="Wallet address (0x...)"
+def main(argv=None):
+    configure_stdout()
+    
+    parser = argparse.ArgumentParser(
+        description="Analyze trader win/loss performance",
+        parents=[make_address_parser(required=False)]
     )
     parser.add_argument(
         "--username",
@@ -341,7 +391,10 @@ def main():
         default=500,
         help="Max trades to analyze (default: 500)"
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    if args.cache:
+        enable_cache()
     
     if not args.address and not args.username:
         print("Error: Must provide either --address or --username")
@@ -350,12 +403,10 @@ def main():
     # Get address
     if args.username:
         # For username, we'll need to use the trades endpoint directly
-        address_to_use = args.username
         formatted_address = args.username
     else:
         try:
             formatted_address = format_address(args.address)
-            address_to_use = args.address
         except ValueError as e:
             print(f"Error: {e}")
             sys.exit(1)
@@ -363,10 +414,16 @@ def main():
     print(f"🔍 Analyzing trader: {formatted_address}")
     print("⏳ Fetching data...\n")
     
-    # Run analyses
-    trade_stats = analyze_trades(address_to_use, args.limit)
-    closed_stats = analyze_closed_positions(address_to_use, 50)
-    open_stats = analyze_open_positions(address_to_use, 100)
+    # Run analyses concurrently - each one is a single independent
+    # request, so the wait is the slowest of the three, not their sum
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        trades_future = executor.submit(analyze_trades, formatted_address, args.limit)
+        closed_future = executor.submit(analyze_closed_positions, formatted_address, 50)
+        open_future = executor.submit(analyze_open_positions, formatted_address, 100)
+    
+    trade_stats = trades_future.result()
+    closed_stats = closed_future.result()
+    open_stats = open_future.result()
     
     # Display results
     display_analysis(trade_stats, closed_stats, open_stats, formatted_address)
@@ -17,37 +17,113 @@ Usage:
     python trader_profitability.py --username noctus
     python trader_profitability.py --address 0x... --period MONTH
     python trader_profitability.py --address 0x... --detailed
+    python trader_profitability.py --addresses-file wallets.txt
+    python trader_profitability.py --address 0x... --quiet && echo profitable
 """
 
 import requests
 import argparse
 import sys
-from utils import format_address, format_pnl, format_percentage
+from contextlib import nullcontext, redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+from heapq import nlargest
+from operator import itemgetter
+from api_client import MAX_CONNECTIONS, SESSION, enable_cache, fetch_pages, parse_json_list
+from utils import configure_stdout, format_address, format_pnl, format_percentage, make_address_parser, reduce_pnl, write_lines
 
 
-def get_active_positions(address, limit=500):
+# Largest page /positions returns. Wallets with more active positions
+# are read in further pages, SPECULATIVE_PAGES at a time in parallel.
+POSITIONS_PAGE_SIZE = 500
+SPECULATIVE_PAGES = 3
+
+
+def get_active_positions_page(address, offset, limit=POSITIONS_PAGE_SIZE):
+    """
+    Get one page of active positions
+    
+    Raises:
+        requests.exceptions.RequestException: If the request fails
+    """
+    response = SESSION.get(
+        "https://data-api.polymarket.com/positions",
+        params={
+            "user": address,
+            "limit": limit,
+            "offset": offset,
+            "redeemable": "false"  # Active positions only
+        },
+        timeout=15
+    )
+    response.raise_for_status()
+    return parse_json_list(response)
+
+
+@lru_cache(maxsize=128)
+def _fetch_active_positions(address):
+    """
+    Fetch every page of active positions, memoized for the process
+    
+    Failed fetches raise and are not cached. The cached tuple is shared
+    between callers, so its position dicts must not be mutated.
+    """
+    positions = get_active_positions_page(address, 0)
+    batch = positions
+    batch_size = POSITIONS_PAGE_SIZE
+    
+    # Keep going while the last batch came back full
+    while len(batch) == batch_size:
+        batch_size = SPECULATIVE_PAGES * POSITIONS_PAGE_SIZE
+        batch = fetch_pages(
+            partial(get_active_positions_page, address),
+            batch_size,
+            POSITIONS_PAGE_SIZE,
+            start=len(positions)
+        )
+        positions.extend(batch)
+    return tuple(positions)
+
+
+def get_active_positions(address):
     """
     Get all active positions with unrealized P&L
     
     Endpoint: /positions
     Key fields: cashPnl (unrealized), realizedPnl (if partially sold)
+    
+    Most wallets fit in the first page. When it comes back full, the
+    next SPECULATIVE_PAGES pages are requested concurrently, repeating
+    until a page comes back short. Results are reused for the rest of
+    the process, so analyzing a wallet twice only fetches it once.
     """
-    url = "https://data-api.polymarket.com/positions"
     try:
-        response = requests.get(
-            url,
-            params={
-                "user": address,
-                "limit": limit,
-                "redeemable": "false"  # Active positions only
-            },
-            timeout=15
-        )
-        response.raise_for_status()
-        return response.json()
+        return _fetch_active_positions(address)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching active positions: {e}")
-        return []
+        return ()
+
+
+@lru_cache(maxsize=128)
+def _fetch_closed_positions(address, limit):
+    """
+    Fetch closed positions, memoized for the process
+    
+    Failed fetches raise and are not cached. The cached tuple is shared
+    between callers, so its position dicts must not be mutated.
+    """
+    response = SESSION.get(
+        "https://data-api.polymarket.com/closed-positions",
+        params={
+            "user": address,
+            "limit": limit,
+            "sortBy": "REALIZEDPNL",
+            "sortDirection": "DESC"
+        },
+        timeout=15
+    )
+    response.raise_for_status()
+    return tuple(parse_json_list(response))
 
 
 def get_closed_positions(address, limit=50):
@@ -57,23 +133,11 @@ def get_closed_positions(address, limit=50):
     Endpoint: /closed-positions
     Key field: realizedPnl (final profit/loss from fully closed position)
     """
-    url = "https://data-api.polymarket.com/closed-positions"
     try:
-        response = requests.get(
-            url,
-            params={
-                "user": address,
-                "limit": limit,
-                "sortBy": "REALIZEDPNL",
-                "sortDirection": "DESC"
-            },
-            timeout=15
-        )
-        response.raise_for_status()
-        return response.json()
+        return _fetch_closed_positions(address, limit)
     except requests.exceptions.RequestException as e:
         print(f"Error fetching closed positions: {e}")
-        return []
+        return ()
 
 
 def get_leaderboard_pnl(username=None, address=None, time_period="DAY"):
@@ -85,7 +149,7 @@ def get_leaderboard_pnl(username=None, address=None, time_period="DAY"):
     
     Args:
         username (str): Polymarket username
-        address (str): Wallet address (will be formatted)
+        address (str): Wallet address, already formatted with format_address()
         time_period (str): DAY, WEEK, MONTH, ALL
     
     Returns:
@@ -102,15 +166,15 @@ def get_leaderboard_pnl(username=None, address=None, time_period="DAY"):
     if username:
         params["userName"] = username
     elif address:
-        params["user"] = format_address(address)
+        params["user"] = address
     else:
         return None
     
     try:
-        response = requests.get(url, params=params, timeout=15)
+        response = SESSION.get(url, params=params, timeout=15)
         response.raise_for_status()
-        data = response.json()
-        return data[0] if data and len(data) > 0 else None
+        data = parse_json_list(response)
+        return data[0] if data else None
     except requests.exceptions.RequestException as e:
         print(f"Warning: Could not fetch leaderboard data: {e}")
         return None
@@ -123,39 +187,32 @@ def calculate_profitability(address, show_details=False, time_period="DAY", user
     Returns:
         dict: Profitability stats
     """
-    print(f"🔍 Analyzing profitability for {address}...")
-    print()
+    # Fetch positions concurrently - the two requests are independent,
+    # so the wait is the slower of the two, not their sum
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        active_future = executor.submit(get_active_positions, address)
+        closed_future = executor.submit(get_closed_positions, address)
     
-    # Fetch positions
-    active_positions = get_active_positions(address)
-    closed_positions = get_closed_positions(address)
+    active_positions = active_future.result()
+    closed_positions = closed_future.result()
     
-    # Calculate unrealized P&L (from active positions)
-    unrealized_pnl = 0
-    unrealized_from_partials = 0  # Realized P&L from partially sold positions
-    
-    for pos in active_positions:
-        unrealized_pnl += pos.get('cashPnl', 0)  # Current unrealized P&L
-        # Some positions may have realized P&L from partial sales
-        unrealized_from_partials += pos.get('realizedPnl', 0)
+    # Calculate unrealized P&L (from active positions) and realized P&L
+    # from partially sold ones, classifying winners/losers in the same pass
+    unrealized_pnl, unrealized_from_partials, winning_active, losing_active = reduce_pnl(
+        active_positions, 'cashPnl', 'realizedPnl'
+    )
     
     # Calculate realized P&L (from fully closed positions)
-    realized_pnl = sum(pos.get('realizedPnl', 0) for pos in closed_positions)
+    realized_pnl, _, winning_closed, losing_closed = reduce_pnl(closed_positions, 'realizedPnl')
     
     # Total P&L = Unrealized + Realized (including partial sales)
     total_realized = realized_pnl + unrealized_from_partials
     total_pnl = unrealized_pnl + total_realized
     
     # Calculate stats
-    winning_active = [p for p in active_positions if p.get('cashPnl', 0) > 0]
-    losing_active = [p for p in active_positions if p.get('cashPnl', 0) < 0]
-    
-    winning_closed = [p for p in closed_positions if p.get('realizedPnl', 0) > 0]
-    losing_closed = [p for p in closed_positions if p.get('realizedPnl', 0) < 0]
-    
     total_positions = len(active_positions) + len(closed_positions)
-    total_winning = len(winning_active) + len(winning_closed)
-    total_losing = len(losing_active) + len(losing_closed)
+    total_winning = winning_active + winning_closed
+    total_losing = losing_active + losing_closed
     
     win_rate = (total_winning / total_positions * 100) if total_positions > 0 else 0
     
@@ -166,10 +223,10 @@ def calculate_profitability(address, show_details=False, time_period="DAY", user
         "active_positions": len(active_positions),
         "closed_positions": len(closed_positions),
         "total_positions": total_positions,
-        "winning_active": len(winning_active),
-        "losing_active": len(losing_active),
-        "winning_closed": len(winning_closed),
-        "losing_closed": len(losing_closed),
+        "winning_active": winning_active,
+        "losing_active": losing_active,
+        "winning_closed": winning_closed,
+        "losing_closed": losing_closed,
         "total_winning": total_winning,
         "total_losing": total_losing,
         "win_rate": win_rate,
@@ -177,133 +234,215 @@ def calculate_profitability(address, show_details=False, time_period="DAY", user
     }
     
     if show_details:
-        stats["active_positions_data"] = active_positions
-        stats["closed_positions_data"] = closed_positions
+        # Keep only what the detailed listing prints, read from each
+        # position dict once: (pnl, percent pnl, realized pnl, title)
+        stats["active_positions_data"] = [
+            (get('cashPnl', 0), get('percentPnl', 0), get('realizedPnl', 0), get('title', 'Unknown'))
+            for get in (pos.get for pos in active_positions)
+        ]
+        # (realized pnl, title)
+        stats["closed_positions_data"] = [
+            (get('realizedPnl', 0), get('title', 'Unknown'))
+            for get in (pos.get for pos in closed_positions)
+        ]
     
     return stats
 
 
+def calculate_profitability_batch(addresses, show_details=False):
+    """
+    Calculate profitability for several addresses concurrently
+    
+    Each address already fetches its two endpoints in parallel, so at most
+    MAX_CONNECTIONS // 2 addresses run at once to keep every request on a
+    pooled connection.
+    
+    Args:
+        addresses (list): Wallet addresses, already formatted with format_address()
+        show_details (bool): Keep position data for the detailed listing
+    
+    Returns:
+        list: Profitability stats, in the same order as addresses
+    """
+    with ThreadPoolExecutor(max_workers=max(1, MAX_CONNECTIONS // 2)) as executor:
+        return list(executor.map(
+            lambda address: calculate_profitability(address, show_details),
+            addresses
+        ))
+
+
+def read_addresses(path):
+    """
+    Read wallet addresses from a file, one per line
+    
+    Blank lines and lines starting with # are skipped.
+    
+    Raises:
+        ValueError: If an address is invalid
+    """
+    with open(path) as f:
+        lines = [line.strip() for line in f]
+    return [format_address(line) for line in lines if line and not line.startswith('#')]
+
+
+# (verdict, emoji) keyed by the sign of the total P&L
+_VERDICTS = {
+    1: ("✅ PROFITABLE", "🚀"),
+    -1: ("❌ IN LOSS", "📉"),
+    0: ("⚖️  BREAK EVEN", "➡️"),
+}
+
+
 def display_profitability(stats, show_details=False):
     """Display profitability analysis"""
+    lines = []
+    out = lines.append
     
-    print("=" * 100)
-    print("TRADER PROFITABILITY ANALYSIS")
-    print("=" * 100)
-    print()
+    out("=" * 100)
+    out("TRADER PROFITABILITY ANALYSIS")
+    out("=" * 100)
+    out("")
     
     # Overall verdict
     total_pnl = stats["total_pnl"]
-    if total_pnl > 0:
-        verdict = "✅ PROFITABLE"
-        emoji = "🚀"
-    elif total_pnl < 0:
-        verdict = "❌ IN LOSS"
-        emoji = "📉"
-    else:
-        verdict = "⚖️  BREAK EVEN"
-        emoji = "➡️"
+    verdict, emoji = _VERDICTS[(total_pnl > 0) - (total_pnl < 0)]
     
-    print(f"{emoji}  {verdict}")
-    print(f"\nTotal P&L: {format_pnl(total_pnl)}")
-    print()
-    print("-" * 100)
+    out(f"{emoji}  {verdict}")
+    out(f"\nTotal P&L: {format_pnl(total_pnl)}")
+    out("")
+    out("-" * 100)
     
     # P&L Breakdown
-    print("\n📊 P&L BREAKDOWN")
-    print("-" * 100)
-    print(f"Unrealized P&L (Active Positions):  {format_pnl(stats['unrealized_pnl'])}")
-    print(f"Realized P&L (Closed Positions):    {format_pnl(stats['realized_pnl'])}")
-    print(f"{'─' * 40}")
-    print(f"TOTAL P&L:                           {format_pnl(stats['total_pnl'])}")
+    out("\n📊 P&L BREAKDOWN")
+    out("-" * 100)
+    out(f"Unrealized P&L (Active Positions):  {format_pnl(stats['unrealized_pnl'])}")
+    out(f"Realized P&L (Closed Positions):    {format_pnl(stats['realized_pnl'])}")
+    out(f"{'─' * 40}")
+    out(f"TOTAL P&L:                           {format_pnl(stats['total_pnl'])}")
     
     # Position Stats
-    print("\n\n📈 POSITION STATISTICS")
-    print("-" * 100)
-    print(f"Total Positions Traded: {stats['total_positions']}")
-    print(f"  ├─ Active: {stats['active_positions']}")
-    print(f"  └─ Closed: {stats['closed_positions']}")
-    print()
-    print(f"Winning Positions: {stats['total_winning']} 📈")
-    print(f"  ├─ Active: {stats['winning_active']}")
-    print(f"  └─ Closed: {stats['winning_closed']}")
-    print()
-    print(f"Losing Positions: {stats['total_losing']} 📉")
-    print(f"  ├─ Active: {stats['losing_active']}")
-    print(f"  └─ Closed: {stats['losing_closed']}")
-    print()
-    print(f"Win Rate: {stats['win_rate']:.1f}%")
+    out("\n\n📈 POSITION STATISTICS")
+    out("-" * 100)
+    out(f"Total Positions Traded: {stats['total_positions']}")
+    out(f"  ├─ Active: {stats['active_positions']}")
+    out(f"  └─ Closed: {stats['closed_positions']}")
+    out("")
+    out(f"Winning Positions: {stats['total_winning']} 📈")
+    out(f"  ├─ Active: {stats['winning_active']}")
+    out(f"  └─ Closed: {stats['winning_closed']}")
+    out("")
+    out(f"Losing Positions: {stats['total_losing']} 📉")
+    out(f"  ├─ Active: {stats['losing_active']}")
+    out(f"  └─ Closed: {stats['losing_closed']}")
+    out("")
+    out(f"Win Rate: {stats['win_rate']:.1f}%")
     
     # Detailed breakdown
     if show_details and "active_positions_data" in stats:
-        print("\n\n💼 TOP 10 ACTIVE POSITIONS (by P&L)")
-        print("-" * 100)
+        out("\n\n💼 TOP 10 ACTIVE POSITIONS (by P&L)")
+        out("-" * 100)
         
-        active = sorted(
-            stats["active_positions_data"],
-            key=lambda x: x.get('cashPnl', 0),
-            reverse=True
-        )[:10]
+        active = nlargest(10, stats["active_positions_data"], key=itemgetter(0))
         
-        for i, pos in enumerate(active, 1):
-            cash_pnl = pos.get('cashPnl', 0)
-            percent_pnl = pos.get('percentPnl', 0)
+        for i, (cash_pnl, percent_pnl, realized, title) in enumerate(active, 1):
             status = "📈" if cash_pnl > 0 else "📉"
             
-            print(f"{i:2d}. {status} {pos.get('title', 'Unknown')[:60]}")
-            print(f"     Unrealized: {format_pnl(cash_pnl)} ({format_percentage(percent_pnl)})")
+            out(f"{i:2d}. {status} {title[:60]}")
+            out(f"     Unrealized: {format_pnl(cash_pnl)} ({format_percentage(percent_pnl)})")
             
-            realized = pos.get('realizedPnl', 0)
             if realized != 0:
-                print(f"     Realized (partial sales): {format_pnl(realized)}")
+                out(f"     Realized (partial sales): {format_pnl(realized)}")
         
-        print("\n\n💰 TOP 10 CLOSED POSITIONS (by Realized P&L)")
-        print("-" * 100)
+        out("\n\n💰 TOP 10 CLOSED POSITIONS (by Realized P&L)")
+        out("-" * 100)
         
-        closed = sorted(
-            stats["closed_positions_data"],
-            key=lambda x: x.get('realizedPnl', 0),
-            reverse=True
-        )[:10]
+        closed = nlargest(10, stats["closed_positions_data"], key=itemgetter(0))
         
-        for i, pos in enumerate(closed, 1):
-            realized_pnl = pos.get('realizedPnl', 0)
+        for i, (realized_pnl, title) in enumerate(closed, 1):
             status = "📈" if realized_pnl > 0 else "📉"
             
-            print(f"{i:2d}. {status} {pos.get('title', 'Unknown')[:60]}")
-            print(f"     Realized P&L: {format_pnl(realized_pnl)}")
+            out(f"{i:2d}. {status} {title[:60]}")
+            out(f"     Realized P&L: {format_pnl(realized_pnl)}")
     
-    print("\n" + "=" * 100)
+    out("\n" + "=" * 100)
+    
+    write_lines(lines)
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Analyze trader profitability")
+def main(argv=None):
+    configure_stdout()
+    
+    parser = argparse.ArgumentParser(
+        description="Analyze trader profitability",
+        parents=[make_address_parser(required=False)]
+    )
     parser.add_argument(
-        "--address",
+        "--addresses-file",
         type=str,
-        required=True,
-        help="Wallet address (0x...)"
+        help="File with one wallet address per line (analyzed concurrently)"
     )
     parser.add_argument(
         "--detailed",
         action="store_true",
         help="Show detailed position breakdown"
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Print no report (fetch errors go to stderr); only set the exit code (0 = profitable)"
+    )
+    args = parser.parse_args(argv)
+    
+    if not args.address and not args.addresses_file:
+        print("Error: Must provide either --address or --addresses-file", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.address and args.addresses_file:
+        print("Error: --address and --addresses-file cannot be combined", file=sys.stderr)
+        sys.exit(1)
+    
+    if args.cache:
+        enable_cache()
     
     try:
-        formatted_address = format_address(args.address)
-    except ValueError as e:
-        print(f"Error: {e}")
+        if args.addresses_file:
+            addresses = read_addresses(args.addresses_file)
+        else:
+            addresses = [format_address(args.address)]
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
     
-    # Calculate profitability
-    stats = calculate_profitability(formatted_address, args.detailed)
+    # An empty file must not count as "every wallet is profitable"
+    if not addresses:
+        print(f"Error: No addresses found in {args.addresses_file}", file=sys.stderr)
+        sys.exit(1)
+    
+    # Quiet mode only needs the verdict, so skip the report entirely
+    show_details = args.detailed and not args.quiet
+    
+    if not args.quiet:
+        if len(addresses) == 1:
+            print(f"🔍 Analyzing profitability for {addresses[0]}...")
+        else:
+            print(f"🔍 Analyzing profitability for {len(addresses)} addresses...")
+        print()
+    
+    # Calculate profitability. In quiet mode the fetch helpers' error
+    # messages go to stderr, keeping stdout empty.
+    with redirect_stdout(sys.stderr) if args.quiet else nullcontext():
+        all_stats = calculate_profitability_batch(addresses, show_details)
     
     # Display results
-    display_profitability(stats, args.detailed)
+    if not args.quiet:
+        for address, stats in zip(addresses, all_stats):
+            if len(addresses) > 1:
+                print(f"\n👤 {address}")
+            display_profitability(stats, show_details)
     
-    # Exit code based on profitability (useful for scripting)
-    sys.exit(0 if stats["is_profitable"] else 1)
+    # Exit code based on profitability (useful for scripting):
+    # 0 only if every address is profitable
+    sys.exit(0 if all(stats["is_profitable"] for stats in all_stats) else 1)
 
 
 if __name__ == "__main__":
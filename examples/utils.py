@@ -5,6 +5,13 @@ This module provides shared helper functions used across
 all Data API example scripts.
 """
 
+import functools
+import sys
+
+
+# Valid characters of a lowercase hex string, for C-level subset checks
+_HEX_DIGITS = frozenset('0123456789abcdef')
+
 
 def format_address(address):
     """
@@ -34,8 +41,10 @@ def format_address(address):
     if not address:
         raise ValueError("Address is required")
     
-    # Remove 0x prefix if present, then convert to lowercase
-    clean = address.lower().replace('0x', '')
+    # Convert to lowercase, then remove the 0x prefix if present
+    clean = address.lower()
+    if clean.startswith('0x'):
+        clean = clean[2:]
     
     # Validate length
     if len(clean) != 40:
@@ -45,7 +54,7 @@ def format_address(address):
         )
     
     # Validate hex characters
-    if not all(c in '0123456789abcdef' for c in clean):
+    if not _HEX_DIGITS.issuperset(clean):
         raise ValueError("Address contains invalid hex characters")
     
     # Return with 0x prefix
@@ -73,8 +82,10 @@ def format_condition_id(condition_id):
     if not condition_id:
         raise ValueError("Condition ID is required")
     
-    # Remove 0x prefix if present, then convert to lowercase
-    clean = condition_id.lower().replace('0x', '')
+    # Convert to lowercase, then remove the 0x prefix if present
+    clean = condition_id.lower()
+    if clean.startswith('0x'):
+        clean = clean[2:]
     
     # Validate length
     if len(clean) != 64:
@@ -84,7 +95,7 @@ def format_condition_id(condition_id):
         )
     
     # Validate hex characters
-    if not all(c in '0123456789abcdef' for c in clean):
+    if not _HEX_DIGITS.issuperset(clean):
         raise ValueError("Condition ID contains invalid hex characters")
     
     # Return with 0x prefix
@@ -127,6 +138,96 @@ def format_percentage(percent):
         return f"{percent:.2f}%"
 
 
+def reduce_pnl(records, key, partial_key=None):
+    """
+    Accumulate P&L statistics over position records in a single pass.
+    
+    Args:
+        records (list): Position dicts
+        key (str): P&L field to total and classify (cashPnl or realizedPnl)
+        partial_key (str): Optional second field summed in the same pass
+    
+    Returns:
+        tuple: (total, partial total, winning count, losing count)
+    """
+    total = partial = 0
+    winning = losing = 0
+    for record in records:
+        get = record.get
+        pnl = get(key, 0)
+        total += pnl
+        if pnl > 0:
+            winning += 1
+        elif pnl < 0:
+            losing += 1
+        if partial_key:
+            partial += get(partial_key, 0)
+    return total, partial, winning, losing
+
+
+def write_lines(lines):
+    """
+    Write report lines to stdout in a single call.
+    
+    Scripts collect their output in a list and flush it once, instead
+    of issuing one print() (and one write) per line.
+    
+    Args:
+        lines (list): Lines of text, without trailing newlines
+    """
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def configure_stdout():
+    """
+    Write stdout as UTF-8 regardless of the console's default encoding.
+    
+    Reports contain emoji and box-drawing characters, which legacy
+    console encodings (e.g. cp1252 on Windows) cannot encode. Call once
+    at the start of main(); stdout replacements without reconfigure()
+    (such as io.StringIO) are left alone.
+    """
+    reconfigure = getattr(sys.stdout, "reconfigure", None)
+    if reconfigure is not None and sys.stdout.encoding.lower() != "utf-8":
+        reconfigure(encoding="utf-8")
+
+
+@functools.cache
+def make_address_parser(required=True):
+    """
+    Parent parser with the options shared by the wallet scripts.
+    
+    Adds --address and --cache. Scripts pass it via parents=[...] and add
+    their own options (--limit defaults and maximums differ per endpoint).
+    The parser is built once per process, so running several scripts
+    in-process (see poly.py) does not rebuild it.
+    
+    Args:
+        required (bool): Whether --address must be given
+    
+    Returns:
+        argparse.ArgumentParser: Parent parser (add_help=False)
+    """
+    # Imported here so code that only needs the formatting helpers does
+    # not pay for argparse (and gettext) on import
+    import argparse
+    
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument(
+        "--address",
+        type=str,
+        required=required,
+        help="Wallet address (0x...)"
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache API responses on disk (faster repeat runs)"
+    )
+    return parser
+
+
 # Example wallet addresses for testing (replace with real addresses)
 EXAMPLE_ADDRESSES = {
     "trader1": "0x56687bf447db6ffa42ffe2204a05edaa20f55839",